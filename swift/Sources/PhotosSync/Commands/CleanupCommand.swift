@@ -62,19 +62,23 @@ struct CleanupCommand: AsyncParsableCommand {
         // Build a map of Photos assets for paired video detection
         let photosAssetMap = Dictionary(uniqueKeysWithValues: photosAssets.map { ($0.localIdentifier, $0) })
         
+        // Everything cleanup needs from the tracker, loaded once rather than per asset
+        let trackerInfo = tracker.getCleanupInfo()
+        
         // === PART 1: Deleted from Immich → Delete from Photos ===
         var toDeleteFromPhotos: [(uuid: String, immichID: String)] = []
         var skippedPairedAssets = 0  // Assets with paired video without motion video backup
         
         for uuid in importedUUIDs {
-            if let immichID = tracker.getImmichIDForUUID(uuid) {
+            guard let info = trackerInfo[uuid] else { continue }
+            if let immichID = info.immichID {
                 if !immichAssetIDs.contains(immichID) {
                     // This was imported but no longer exists in Immich
                     
                     // SAFETY CHECK: For assets with paired video, ensure motion video is backed up
                     if let asset = photosAssetMap[uuid], asset.hasPairedVideo {
                         // Check if we have the motion video backed up
-                        if !tracker.hasMotionVideoBackup(uuid: uuid) {
+                        if !info.hasMotionVideoBackup {
                             // Skip this asset - motion video not backed up
                             // Deleting it would lose the motion video forever
                             skippedPairedAssets += 1
@@ -83,8 +87,7 @@ struct CleanupCommand: AsyncParsableCommand {
                     }
                     
                     // Also check tracker's paired video status for assets not in Photos library
-                    if (tracker.isLivePhoto(uuid: uuid) || tracker.hasPairedVideo(uuid: uuid)) 
-                       && !tracker.hasMotionVideoBackup(uuid: uuid) {
+                    if info.hasPairedVideo && !info.hasMotionVideoBackup {
                         skippedPairedAssets += 1
                         continue
                     }
@@ -98,12 +101,14 @@ struct CleanupCommand: AsyncParsableCommand {
         var toArchiveInImmich: [(uuid: String, immichID: String)] = []
         
         for uuid in importedUUIDs {
+            guard let info = trackerInfo[uuid] else { continue }
+            
             // Skip already archived
-            if tracker.isArchived(uuid: uuid) {
+            if info.isArchived {
                 continue
             }
             
-            if let immichID = tracker.getImmichIDForUUID(uuid) {
+            if let immichID = info.immichID {
                 // Check if it still exists in Immich but not in Photos
                 if immichAssetIDs.contains(immichID) && !photosUUIDs.contains(uuid) {
                     toArchiveInImmich.append((uuid: uuid, immichID: immichID))
@@ -21,8 +21,8 @@ struct ImportCommand: AsyncParsableCommand {
     @Option(name: .long, help: "Maximum number of photos to process (0 = unlimited)")
     var limit: Int = 0
     
-    @Option(name: .long, help: "Number of concurrent imports")
-    var concurrency: Int = 1
+    @Option(name: .long, help: "Number of concurrent imports, 1-20 (default: 4 local, 1 with --include-cloud)")
+    var concurrency: Int?
     
     @Option(name: .long, help: "Delay between iCloud downloads in seconds")
     var delay: Double = 5.0
@@ -34,6 +34,9 @@ struct ImportCommand: AsyncParsableCommand {
     @Flag(name: .long, help: "Repair Cinematic videos that were imported without sidecars")
     var repairCinematic: Bool = false
     
+    @Flag(name: .long, help: "Hash each file and skip the upload if Immich already has it (for re-runs against a populated Immich)")
+    var checkDuplicates: Bool = false
+    
     func run() async throws {
         // Handle repair modes separately
         if repairPairedVideos {
@@ -75,12 +78,12 @@ struct ImportCommand: AsyncParsableCommand {
         
         // Get assets
         print("Loading Photos library...")
-        let allAssets = PhotosFetcher.getAllAssets()
-        print("Total assets in library: \(formatNumber(allAssets.count))")
+        print("Total assets in library: \(formatNumber(PhotosFetcher.libraryAssetCount()))")
         
-        // Filter to not-yet-imported
-        let candidates = allAssets.filter { !importedUUIDs.contains($0.localIdentifier) }
-        print("Not yet imported: \(formatNumber(candidates.count))")
+        // Already-imported assets are skipped during the scan, before their resources are read
+        let candidates = PhotosFetcher.getAllAssets(excluding: importedUUIDs)
+        let candidateCount = candidates.count
+        print("Not yet imported: \(formatNumber(candidateCount))")
         
         // Filter by local/cloud if needed
         var toImport: [PhotosFetcher.AssetInfo] = []
@@ -90,29 +93,35 @@ struct ImportCommand: AsyncParsableCommand {
             if skipLocalCheck && !includeCloud {
                 print("Skipping local availability check (will fail fast on cloud-only assets)")
             }
-            toImport = candidates
             // Apply limit
-            if limit > 0 && toImport.count > limit {
-                toImport = Array(toImport.prefix(limit))
-            }
+            toImport = limit > 0 ? Array(candidates.prefix(limit)) : candidates
         } else {
             print("Checking which assets are locally available...")
             var cloudSkipped = 0
-            for (idx, asset) in candidates.enumerated() {
-                if limit > 0 && toImport.count >= limit { break }
+            var idx = 0
+            // Resolve PHAssets a chunk at a time - one Photos fetch per chunk instead of one per asset
+            let chunkSize = 200
+            scan: for chunkStart in stride(from: 0, to: candidateCount, by: chunkSize) {
+                let chunk = candidates[chunkStart..<min(chunkStart + chunkSize, candidateCount)]
+                let phAssets = PhotosFetcher.fetchAssets(identifiers: chunk.map { $0.localIdentifier })
                 
-                if idx % 100 == 0 && idx > 0 {
-                    print("  Checked \(idx)/\(candidates.count)...")
-                }
-                
-                if PhotosFetcher.isAssetLocal(asset.localIdentifier) {
-                    toImport.append(asset)
-                } else {
-                    cloudSkipped += 1
-                    // Stop checking after finding enough or hitting too many cloud assets
-                    if cloudSkipped > 1000 && toImport.count == 0 {
-                        print("  Most assets are in iCloud, stopping local scan")
-                        break
+                for asset in chunk {
+                    if limit > 0 && toImport.count >= limit { break scan }
+                    
+                    if idx % 100 == 0 && idx > 0 {
+                        print("  Checked \(idx)/\(candidateCount)...")
+                    }
+                    idx += 1
+                    
+                    if let phAsset = phAssets[asset.localIdentifier], PhotosFetcher.isAssetLocal(phAsset) {
+                        toImport.append(asset)
+                    } else {
+                        cloudSkipped += 1
+                        // Stop checking after finding enough or hitting too many cloud assets
+                        if cloudSkipped > 1000 && toImport.count == 0 {
+                            print("  Most assets are in iCloud, stopping local scan")
+                            break scan
+                        }
                     }
                 }
             }
@@ -128,16 +137,27 @@ struct ImportCommand: AsyncParsableCommand {
             return
         }
         
+        // Local exports and uploads are I/O bound, so overlap several of them.
+        // iCloud downloads stay on a single worker unless explicitly overridden.
+        let workers = min(max(concurrency ?? (includeCloud ? 1 : 4), 1), 20)
+        // The pause only exists to be gentle with iCloud; local exports don't need it
+        let pause = includeCloud ? delay : 0
+        
         print()
         print(String(repeating: "=", count: 50))
-        print("IMPORTING \(formatNumber(toImport.count)) ASSETS (concurrency: \(concurrency))")
+        print("IMPORTING \(formatNumber(toImport.count)) ASSETS (concurrency: \(workers))")
         print(String(repeating: "=", count: 50))
         print()
         
         let stats = ImportStatsActor()
         let totalCount = toImport.count
         
-        if concurrency <= 1 {
+        // With a pause, download starts are spaced out by the pacer rather than sleeping after
+        // each asset, so the delay overlaps the previous upload instead of adding to it.
+        // --concurrency still caps the number of assets in flight (and staged on disk)
+        let pacer = pause > 0 ? DownloadPacer(interval: pause) : nil
+        
+        if workers <= 1 {
             // Sequential processing (original behavior)
             for (index, asset) in toImport.enumerated() {
                 await processAsset(
@@ -148,14 +168,11 @@ struct ImportCommand: AsyncParsableCommand {
                     immich: immich,
                     tracker: tracker,
                     stats: stats,
+                    pacer: pacer,
                     dryRun: dryRun,
-                    allowNetwork: includeCloud
+                    allowNetwork: includeCloud,
+                    checkDuplicates: checkDuplicates
                 )
-                
-                // Delay between iCloud downloads
-                if index < toImport.count - 1 && delay > 0 {
-                    try? await Task.sleep(nanoseconds: UInt64(delay * 1_000_000_000))
-                }
             }
         } else {
             // Concurrent processing
@@ -165,7 +182,7 @@ struct ImportCommand: AsyncParsableCommand {
                 
                 while nextIndex < toImport.count {
                     // Add tasks up to concurrency limit
-                    while inFlight < concurrency && nextIndex < toImport.count {
+                    while inFlight < workers && nextIndex < toImport.count {
                         let asset = toImport[nextIndex]
                         let index = nextIndex
                         nextIndex += 1
@@ -180,14 +197,11 @@ struct ImportCommand: AsyncParsableCommand {
                                 immich: immich,
                                 tracker: tracker,
                                 stats: stats,
+                                pacer: pacer,
                                 dryRun: self.dryRun,
-                                allowNetwork: self.includeCloud
+                                allowNetwork: self.includeCloud,
+                                checkDuplicates: self.checkDuplicates
                             )
-                            
-                            // Small delay per task to be gentle on iCloud
-                            if self.delay > 0 {
-                                try? await Task.sleep(nanoseconds: UInt64(self.delay * 1_000_000_000))
-                            }
                         }
                     }
                     
@@ -331,6 +345,8 @@ struct ImportCommand: AsyncParsableCommand {
                 continue
             }
             
+            defer { PhotosFetcher.removeStagingDirectory(for: item.info.uuid, in: config.stagingDir) }
+            
             // Check if asset has paired video resource
             guard PhotosFetcher.hasPairedVideoResource(identifier: item.info.uuid) else {
                 print("  WARNING: No paired video in Photos library")
@@ -342,7 +358,7 @@ struct ImportCommand: AsyncParsableCommand {
             
             // Download just the video component
             print("  Exporting motion video...")
-            let videoResult = await downloadPairedVideoOnly(
+            let videoResult = await PhotosFetcher.downloadPairedVideo(
                 identifier: item.info.uuid,
                 to: config.stagingDir,
                 allowNetwork: includeCloud
@@ -357,7 +373,7 @@ struct ImportCommand: AsyncParsableCommand {
             print("  Video exported: \(formatBytes(videoResult.fileSize))")
             
             // Get dates
-            let dates = PhotosFetcher.getAssetDates(identifier: item.info.uuid)
+            let dates = (created: item.asset.creationDate, modified: item.asset.modificationDate)
             
             // Upload video
             let videoDeviceID = "\(item.info.uuid)_video"
@@ -365,7 +381,8 @@ struct ImportCommand: AsyncParsableCommand {
                 fileURL: videoURL,
                 deviceAssetID: videoDeviceID,
                 fileCreatedAt: dates.created,
-                fileModifiedAt: dates.modified
+                fileModifiedAt: dates.modified,
+                checkDuplicate: true
             )
             
             // Clean up video staging file
@@ -474,40 +491,6 @@ struct ImportCommand: AsyncParsableCommand {
         }
     }
     
-    /// Download just the paired video component of a Live Photo (wrapper for repair mode)
-    private func downloadPairedVideoOnly(
-        identifier: String,
-        to stagingDir: URL,
-        allowNetwork: Bool
-    ) async -> PhotosFetcher.DownloadResult {
-        // We need to access the private downloadPairedVideo function
-        // Since it's private in PhotosFetcher, we'll use downloadLivePhotoAsset and extract just the video
-        let result = await PhotosFetcher.downloadLivePhotoAsset(
-            identifier: identifier,
-            to: stagingDir,
-            allowNetwork: allowNetwork
-        )
-        
-        // Clean up the image file if it was exported
-        if let imageURL = result.imageResult.fileURL {
-            try? FileManager.default.removeItem(at: imageURL)
-        }
-        
-        // Return the video result
-        if let videoResult = result.videoResult {
-            return videoResult
-        } else {
-            return PhotosFetcher.DownloadResult(
-                localIdentifier: identifier,
-                filename: "unknown",
-                fileURL: nil,
-                fileSize: 0,
-                mediaType: "video",
-                error: "No paired video found"
-            )
-        }
-    }
-    
     private func processAsset(
         asset: PhotosFetcher.AssetInfo,
         index: Int,
@@ -516,8 +499,10 @@ struct ImportCommand: AsyncParsableCommand {
         immich: ImmichClient,
         tracker: Tracker,
         stats: ImportStatsActor,
+        pacer: DownloadPacer?,
         dryRun: Bool,
-        allowNetwork: Bool
+        allowNetwork: Bool,
+        checkDuplicates: Bool
     ) async {
         let num = index + 1
         var labels: [String] = []
@@ -538,8 +523,10 @@ struct ImportCommand: AsyncParsableCommand {
             return
         }
         
-        // Get dates upfront
-        let dates = PhotosFetcher.getAssetDates(identifier: asset.localIdentifier)
+        defer { PhotosFetcher.removeStagingDirectory(for: asset.localIdentifier, in: config.stagingDir) }
+        
+        // Dates were captured when the library was scanned - no need to re-fetch the PHAsset
+        let dates = (created: asset.creationDate, modified: asset.modificationDate)
         
         // Handle Cinematic videos with multi-resource export
         if asset.isCinematic {
@@ -550,7 +537,9 @@ struct ImportCommand: AsyncParsableCommand {
                 immich: immich,
                 tracker: tracker,
                 stats: stats,
-                allowNetwork: allowNetwork
+                pacer: pacer,
+                allowNetwork: allowNetwork,
+                checkDuplicates: checkDuplicates
             )
             return
         }
@@ -564,12 +553,15 @@ struct ImportCommand: AsyncParsableCommand {
                 immich: immich,
                 tracker: tracker,
                 stats: stats,
-                allowNetwork: allowNetwork
+                pacer: pacer,
+                allowNetwork: allowNetwork,
+                checkDuplicates: checkDuplicates
             )
             return
         }
         
         // Standard asset processing (non-Live Photo)
+        await pacer?.waitForTurn()
         if allowNetwork {
             print("  Downloading from iCloud...")
         } else {
@@ -588,7 +580,7 @@ struct ImportCommand: AsyncParsableCommand {
             try? tracker.markFailed(
                 uuid: asset.localIdentifier,
                 filename: asset.filename,
-                mediaType: mediaTypeString(asset.mediaType),
+                mediaType: asset.mediaTypeName,
                 reason: reason,
                 createdAt: asset.creationDate
             )
@@ -602,7 +594,7 @@ struct ImportCommand: AsyncParsableCommand {
             try? tracker.markFailed(
                 uuid: asset.localIdentifier,
                 filename: asset.filename,
-                mediaType: mediaTypeString(asset.mediaType),
+                mediaType: asset.mediaTypeName,
                 reason: reason,
                 createdAt: asset.creationDate
             )
@@ -613,12 +605,13 @@ struct ImportCommand: AsyncParsableCommand {
         await stats.incrementExported()
         print("  Exported: \(formatBytes(downloadResult.fileSize))")
         
-        // Upload to Immich
+        // Upload to Immich - skipped if it already has these exact bytes (common on re-imports)
         let uploadResult = await immich.uploadAsset(
             fileURL: fileURL,
             deviceAssetID: asset.localIdentifier,
             fileCreatedAt: dates.created,
-            fileModifiedAt: dates.modified
+            fileModifiedAt: dates.modified,
+            checkDuplicate: checkDuplicates
         )
         
         // Clean up staging file
@@ -679,9 +672,12 @@ struct ImportCommand: AsyncParsableCommand {
         immich: ImmichClient,
         tracker: Tracker,
         stats: ImportStatsActor,
-        allowNetwork: Bool
+        pacer: DownloadPacer?,
+        allowNetwork: Bool,
+        checkDuplicates: Bool
     ) async {
         let assetType = asset.isLivePhoto ? "Live Photo" : "paired asset"
+        await pacer?.waitForTurn()
         print("  Exporting \(assetType) (image + video)...")
         
         // Download both image and video
@@ -698,7 +694,7 @@ struct ImportCommand: AsyncParsableCommand {
             try? tracker.markFailed(
                 uuid: asset.localIdentifier,
                 filename: asset.filename,
-                mediaType: mediaTypeString(asset.mediaType),
+                mediaType: asset.mediaTypeName,
                 reason: reason,
                 createdAt: asset.creationDate
             )
@@ -712,7 +708,7 @@ struct ImportCommand: AsyncParsableCommand {
             try? tracker.markFailed(
                 uuid: asset.localIdentifier,
                 filename: asset.filename,
-                mediaType: mediaTypeString(asset.mediaType),
+                mediaType: asset.mediaTypeName,
                 reason: reason,
                 createdAt: asset.creationDate
             )
@@ -735,7 +731,8 @@ struct ImportCommand: AsyncParsableCommand {
                 fileURL: videoURL,
                 deviceAssetID: videoDeviceID,
                 fileCreatedAt: dates.created,
-                fileModifiedAt: dates.modified
+                fileModifiedAt: dates.modified,
+                checkDuplicate: checkDuplicates
             )
             
             // Clean up video staging file
@@ -830,8 +827,11 @@ struct ImportCommand: AsyncParsableCommand {
         immich: ImmichClient,
         tracker: Tracker,
         stats: ImportStatsActor,
-        allowNetwork: Bool
+        pacer: DownloadPacer?,
+        allowNetwork: Bool,
+        checkDuplicates: Bool
     ) async {
+        await pacer?.waitForTurn()
         print("  Exporting Cinematic video (video + sidecars)...")
 
         // Download all resources (main video + sidecars)
@@ -913,7 +913,8 @@ struct ImportCommand: AsyncParsableCommand {
             fileURL: videoURL,
             deviceAssetID: asset.localIdentifier,
             fileCreatedAt: dates.created,
-            fileModifiedAt: dates.modified
+            fileModifiedAt: dates.modified,
+            checkDuplicate: checkDuplicates
         )
 
         // Clean up staging file
@@ -1059,6 +1060,8 @@ struct ImportCommand: AsyncParsableCommand {
                 continue
             }
 
+            defer { PhotosFetcher.removeStagingDirectory(for: item.info.uuid, in: config.stagingDir) }
+
             // Download all resources (we only need the sidecars)
             print("  Exporting sidecars...")
             let cinematicResult = await PhotosFetcher.downloadCinematicVideoAsset(
@@ -1142,15 +1145,6 @@ struct ImportCommand: AsyncParsableCommand {
         formatter.countStyle = .file
         return formatter.string(fromByteCount: bytes)
     }
-    
-    private func mediaTypeString(_ type: PHAssetMediaType) -> String {
-        switch type {
-        case .image: return "photo"
-        case .video: return "video"
-        case .audio: return "audio"
-        default: return "unknown"
-        }
-    }
 }
 
 // Thread-safe stats using actor
@@ -1179,3 +1173,25 @@ actor ImportStatsActor {
         (exported, uploaded, duplicates, failed, skipped, pairedAssets, pairedVideos, cinematicVideos, cinematicSidecars)
     }
 }
+
+/// Spaces out iCloud download starts at least `interval` apart. Only the download step
+/// waits, so uploads keep going in the meantime.
+actor DownloadPacer {
+    private let interval: TimeInterval
+    private var nextStart = Date.distantPast
+    
+    init(interval: TimeInterval) {
+        self.interval = interval
+    }
+    
+    /// Wait until the next download is allowed to start
+    func waitForTurn() async {
+        // Reserve the start time before sleeping so concurrent callers queue behind it
+        let start = max(Date(), nextStart)
+        nextStart = start.addingTimeInterval(interval)
+        let wait = start.timeIntervalSinceNow
+        if wait > 0 {
+            try? await Task.sleep(nanoseconds: UInt64(wait * 1_000_000_000))
+        }
+    }
+}
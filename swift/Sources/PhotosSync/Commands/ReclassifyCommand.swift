@@ -58,6 +58,20 @@ struct ReclassifyCommand: AsyncParsableCommand {
         // Subtype counters
         var subtypeCounts = SubtypeCounts()
         
+        // Subtype updates are written in batches - one transaction each instead of one per asset
+        var pendingUpdates: [(uuid: String, subtypes: Tracker.AssetSubtypes)] = []
+        let batchSize = 1000
+        func flushUpdates() {
+            guard !pendingUpdates.isEmpty else { return }
+            do {
+                try tracker.updateSubtypesBatch(pendingUpdates)
+                updated += pendingUpdates.count
+            } catch {
+                print("  Error updating \(pendingUpdates.count) assets: \(error)")
+            }
+            pendingUpdates.removeAll(keepingCapacity: true)
+        }
+        
         print()
         print("Scanning tracked assets for reclassification...")
         
@@ -106,16 +120,15 @@ struct ReclassifyCommand: AsyncParsableCommand {
                 )
                 
                 // Update just the subtype columns (preserve other data)
-                do {
-                    try tracker.updateSubtypes(uuid: uuid, subtypes: subtypes)
-                    updated += 1
-                } catch {
-                    // Ignore errors - asset might have been deleted
+                pendingUpdates.append((uuid, subtypes))
+                if pendingUpdates.count >= batchSize {
+                    flushUpdates()
                 }
             } else {
                 updated += 1
             }
         }
+        flushUpdates()
         
         // Print results
         print()
@@ -245,6 +258,8 @@ struct ReclassifyCommand: AsyncParsableCommand {
                 continue
             }
             
+            defer { PhotosFetcher.removeStagingDirectory(for: item.uuid, in: config.stagingDir) }
+            
             // Check if asset has paired video resource
             guard PhotosFetcher.hasPairedVideoResource(identifier: item.uuid) else {
                 print("  WARNING: No paired video in Photos library")
@@ -277,7 +292,7 @@ struct ReclassifyCommand: AsyncParsableCommand {
             print("  Image: \(formatBytes(result.imageResult.fileSize)), Video: \(formatBytes(videoResult.fileSize))")
             
             // Get dates
-            let dates = PhotosFetcher.getAssetDates(identifier: item.uuid)
+            let dates = (created: item.asset.creationDate, modified: item.asset.modificationDate)
             
             // Upload video first
             let videoDeviceID = "\(item.uuid)_video"
@@ -285,7 +300,8 @@ struct ReclassifyCommand: AsyncParsableCommand {
                 fileURL: videoURL,
                 deviceAssetID: videoDeviceID,
                 fileCreatedAt: dates.created,
-                fileModifiedAt: dates.modified
+                fileModifiedAt: dates.modified,
+                checkDuplicate: true
             )
             
             try? FileManager.default.removeItem(at: videoURL)
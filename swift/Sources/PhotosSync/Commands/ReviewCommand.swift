@@ -365,6 +365,8 @@ struct ReviewCommand: AsyncParsableCommand {
                 continue
             }
             
+            defer { PhotosFetcher.removeStagingDirectory(for: item.asset.localIdentifier, in: config.stagingDir) }
+            
             // Clear the problem status before retry
             try? tracker.clearProblemStatus(uuid: item.problem.uuid)
             
@@ -411,7 +413,7 @@ struct ReviewCommand: AsyncParsableCommand {
         allowNetwork: Bool
     ) async -> (success: Bool, error: String?) {
         // Get dates
-        let dates = PhotosFetcher.getAssetDates(identifier: asset.localIdentifier)
+        let dates = (created: asset.creationDate, modified: asset.modificationDate)
         
         // Handle Cinematic videos
         if asset.isCinematic {
@@ -449,7 +451,7 @@ struct ReviewCommand: AsyncParsableCommand {
             try? tracker.markFailed(
                 uuid: asset.localIdentifier,
                 filename: asset.filename,
-                mediaType: mediaTypeString(asset.mediaType),
+                mediaType: asset.mediaTypeName,
                 reason: reason,
                 createdAt: asset.creationDate
             )
@@ -461,7 +463,7 @@ struct ReviewCommand: AsyncParsableCommand {
             try? tracker.markFailed(
                 uuid: asset.localIdentifier,
                 filename: asset.filename,
-                mediaType: mediaTypeString(asset.mediaType),
+                mediaType: asset.mediaTypeName,
                 reason: reason,
                 createdAt: asset.creationDate
             )
@@ -473,7 +475,8 @@ struct ReviewCommand: AsyncParsableCommand {
             fileURL: fileURL,
             deviceAssetID: asset.localIdentifier,
             fileCreatedAt: dates.created,
-            fileModifiedAt: dates.modified
+            fileModifiedAt: dates.modified,
+            checkDuplicate: true
         )
         
         // Clean up staging file
@@ -535,7 +538,7 @@ struct ReviewCommand: AsyncParsableCommand {
             try? tracker.markFailed(
                 uuid: asset.localIdentifier,
                 filename: asset.filename,
-                mediaType: mediaTypeString(asset.mediaType),
+                mediaType: asset.mediaTypeName,
                 reason: reason,
                 createdAt: asset.creationDate
             )
@@ -547,7 +550,7 @@ struct ReviewCommand: AsyncParsableCommand {
             try? tracker.markFailed(
                 uuid: asset.localIdentifier,
                 filename: asset.filename,
-                mediaType: mediaTypeString(asset.mediaType),
+                mediaType: asset.mediaTypeName,
                 reason: reason,
                 createdAt: asset.creationDate
             )
@@ -563,7 +566,8 @@ struct ReviewCommand: AsyncParsableCommand {
                 fileURL: videoURL,
                 deviceAssetID: videoDeviceID,
                 fileCreatedAt: dates.created,
-                fileModifiedAt: dates.modified
+                fileModifiedAt: dates.modified,
+                checkDuplicate: true
             )
             
             try? FileManager.default.removeItem(at: videoURL)
@@ -679,7 +683,8 @@ struct ReviewCommand: AsyncParsableCommand {
             fileURL: videoURL,
             deviceAssetID: asset.localIdentifier,
             fileCreatedAt: dates.created,
-            fileModifiedAt: dates.modified
+            fileModifiedAt: dates.modified,
+            checkDuplicate: true
         )
         
         try? FileManager.default.removeItem(at: videoURL)
@@ -729,13 +734,4 @@ struct ReviewCommand: AsyncParsableCommand {
         formatter.numberStyle = .decimal
         return formatter.string(from: NSNumber(value: n)) ?? "\(n)"
     }
-    
-    private func mediaTypeString(_ type: PHAssetMediaType) -> String {
-        switch type {
-        case .image: return "photo"
-        case .video: return "video"
-        case .audio: return "audio"
-        default: return "unknown"
-        }
-    }
 }
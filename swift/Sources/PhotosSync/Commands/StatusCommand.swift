@@ -44,7 +44,7 @@ struct StatusCommand: AsyncParsableCommand {
         
         // Sample to estimate local vs cloud (checking every asset is too slow)
         print("Sampling local availability...")
-        let (sampleLocal, sampleTotal, estimatedLocal) = PhotosFetcher.countLocalAssets(sampleSize: 50)
+        let (sampleLocal, sampleTotal, estimatedLocal) = PhotosFetcher.countLocalAssets(in: assets, sampleSize: 50)
         let estimatedCloud = totalAssets - estimatedLocal
         let readyToImport = max(0, estimatedLocal - alreadyImported)
         
@@ -101,8 +101,8 @@ struct StatusCommand: AsyncParsableCommand {
 
         // Cinematic video stats
         let cinematicStats = tracker.getCinematicStats()
-        if cinematicStats.total > 0 || countCinematic(assets) > 0 {
-            let libraryCount = countCinematic(assets)
+        let libraryCount = countCinematic(assets)
+        if cinematicStats.total > 0 || libraryCount > 0 {
             print("Cinematic Videos:")
             print("  In library:        \(formatNumber(libraryCount))")
             print("  Imported:          \(formatNumber(cinematicStats.total))")
@@ -46,7 +46,7 @@ struct SyncCommand: AsyncParsableCommand {
         print("Total: \(formatNumber(immichAssets.count)) assets to sync")
         
         // Find assets not in tracker
-        var added = 0
+        var missing: [Tracker.ImportRecord] = []
         var skipped = 0
         
         for asset in immichAssets {
@@ -60,19 +60,28 @@ struct SyncCommand: AsyncParsableCommand {
             
             // Add to tracker with default subtypes (unknown from Immich)
             let mediaType = asset.type == "VIDEO" ? "video" : "photo"
+            missing.append(Tracker.ImportRecord(
+                uuid: uuid,
+                immichID: asset.id,
+                filename: asset.originalFileName,
+                fileSize: asset.fileSize,
+                mediaType: mediaType
+            ))
+        }
+        
+        // Write in batches - one transaction per batch instead of one per asset. A large
+        // seed (e.g. a fresh tracker) goes in as one load with the indexes rebuilt at the end
+        var added = 0
+        let isBulkSeed = missing.count >= 10_000
+        let batchSize = isBulkSeed ? missing.count : 500
+        
+        for start in stride(from: 0, to: missing.count, by: batchSize) {
+            let batch = Array(missing[start..<min(start + batchSize, missing.count)])
             do {
-                try tracker.markImported(
-                    uuid: uuid,
-                    immichID: asset.id,
-                    filename: asset.originalFileName,
-                    fileSize: asset.fileSize,
-                    mediaType: mediaType,
-                    subtypes: .none,
-                    motionVideoImmichID: nil
-                )
-                added += 1
+                try tracker.markImportedBatch(batch, rebuildIndexes: isBulkSeed)
+                added += batch.count
             } catch {
-                print("  Error adding \(asset.originalFileName): \(error)")
+                print("  Error adding batch of \(batch.count) assets: \(error)")
             }
         }
         
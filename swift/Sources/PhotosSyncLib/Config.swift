@@ -24,10 +24,12 @@ public struct Config: Sendable {
 
     public static func load(dryRun: Bool = false, batchSize: Int = 100) -> Config? {
         // Find .env file - look in dam directory
-        let damDir = findDAMDirectory()
-        return load(fromDirectory: damDir, dryRun: dryRun, batchSize: batchSize)
+        return load(fromDirectory: damDirectory, dryRun: dryRun, batchSize: batchSize)
     }
 
+    /// Resolved once per process - the directory walk doesn't change between loads
+    private static let damDirectory = findDAMDirectory()
+
     /// Load config from a specific directory (useful for testing)
     public static func load(fromDirectory damDir: URL, dryRun: Bool = false, batchSize: Int = 100) -> Config? {
         let envPath = damDir.appendingPathComponent(".env")
@@ -3,6 +3,21 @@ import SQLite3
 
 private let SQLITE_TRANSIENT = unsafeBitCast(-1, to: sqlite3_destructor_type.self)
 
+/// Same output as a default ISO8601DateFormatter, but a value type that can be shared
+private let createdAtFormat = Date.ISO8601FormatStyle()
+
+/// Parses SQLite CURRENT_TIMESTAMP / datetime('now') values ("yyyy-MM-dd HH:mm:ss", UTC)
+/// Built once and shared, rather than configuring a DateFormatter for every row read
+private let sqliteTimestampFormat = Date.ParseStrategy(
+    format: "\(year: .defaultDigits)-\(month: .twoDigits)-\(day: .twoDigits) \(hour: .twoDigits(clock: .twentyFourHour, hourCycle: .zeroBased)):\(minute: .twoDigits):\(second: .twoDigits)",
+    locale: Locale(identifier: "en_US_POSIX"),
+    timeZone: TimeZone(identifier: "UTC")!
+)
+
+private func sqliteTimestamp(_ cString: UnsafePointer<UInt8>) -> Date? {
+    try? Date(String(cString: cString), strategy: sqliteTimestampFormat)
+}
+
 /// Tracks imported assets - shares SQLite DB with Python code
 /// Thread-safe via serial dispatch queue
 public final class Tracker: @unchecked Sendable {
@@ -17,9 +32,15 @@ public final class Tracker: @unchecked Sendable {
             throw TrackerError.openFailed(String(cString: sqlite3_errmsg(db)))
         }
 
-        // Enable WAL mode for better concurrent read performance
-        var errMsg: UnsafeMutablePointer<CChar>?
-        sqlite3_exec(db, "PRAGMA journal_mode=WAL", nil, nil, &errMsg)
+        // Enable WAL mode for better concurrent read performance. In WAL mode NORMAL
+        // sync is still crash-safe and skips the fsync on every commit; the rest keeps
+        // temp tables and a 64 MB page cache in memory
+        sqlite3_exec(db, """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+            """, nil, nil, nil)
 
         try createTables()
     }
@@ -281,6 +302,7 @@ public final class Tracker: @unchecked Sendable {
         }
     }
 
+    /// Get every tracked UUID in a single scan of the primary key index
     public func getImportedUUIDs() -> Set<String> {
         queue.sync {
             var uuids = Set<String>()
@@ -346,6 +368,72 @@ public final class Tracker: @unchecked Sendable {
         public static let none = AssetSubtypes()
     }
 
+    /// A single import to record, used for batched writes
+    public struct ImportRecord: Sendable {
+        public let uuid: String
+        public let immichID: String?
+        public let filename: String
+        public let fileSize: Int64
+        public let mediaType: String
+        public let subtypes: AssetSubtypes
+        public let motionVideoImmichID: String?
+        public let cinematicSidecars: [String]?
+
+        public init(
+            uuid: String,
+            immichID: String?,
+            filename: String,
+            fileSize: Int64,
+            mediaType: String,
+            subtypes: AssetSubtypes = .none,
+            motionVideoImmichID: String? = nil,
+            cinematicSidecars: [String]? = nil
+        ) {
+            self.uuid = uuid
+            self.immichID = immichID
+            self.filename = filename
+            self.fileSize = fileSize
+            self.mediaType = mediaType
+            self.subtypes = subtypes
+            self.motionVideoImmichID = motionVideoImmichID
+            self.cinematicSidecars = cinematicSidecars
+        }
+    }
+
+    /// Upsert rather than INSERT OR REPLACE: a re-import updates the row in place instead of
+    /// deleting it and inserting a new one. Columns not written here are reset, as REPLACE did.
+    private static let markImportedSQL = """
+        INSERT INTO imported_assets
+        (icloud_uuid, immich_id, filename, file_size, media_type, imported_at, status, error_reason,
+         is_live_photo, is_portrait, is_hdr, is_panorama, is_screenshot,
+         is_cinematic, is_slomo, is_timelapse, is_spatial_video, is_proraw,
+         has_paired_video, motion_video_immich_id, cinematic_sidecars)
+        VALUES (?, ?, ?, ?, ?, datetime('now'), 'imported', NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(icloud_uuid) DO UPDATE SET
+            immich_id = excluded.immich_id,
+            filename = excluded.filename,
+            file_size = excluded.file_size,
+            media_type = excluded.media_type,
+            imported_at = excluded.imported_at,
+            status = excluded.status,
+            error_reason = excluded.error_reason,
+            is_live_photo = excluded.is_live_photo,
+            is_portrait = excluded.is_portrait,
+            is_hdr = excluded.is_hdr,
+            is_panorama = excluded.is_panorama,
+            is_screenshot = excluded.is_screenshot,
+            is_cinematic = excluded.is_cinematic,
+            is_slomo = excluded.is_slomo,
+            is_timelapse = excluded.is_timelapse,
+            is_spatial_video = excluded.is_spatial_video,
+            is_proraw = excluded.is_proraw,
+            has_paired_video = excluded.has_paired_video,
+            motion_video_immich_id = excluded.motion_video_immich_id,
+            cinematic_sidecars = excluded.cinematic_sidecars,
+            archived = 0,
+            asset_created_at = NULL
+    """
+
     public func markImported(
         uuid: String,
         immichID: String?,
@@ -356,66 +444,157 @@ public final class Tracker: @unchecked Sendable {
         motionVideoImmichID: String? = nil,
         cinematicSidecars: [String]? = nil
     ) throws {
+        let record = ImportRecord(
+            uuid: uuid,
+            immichID: immichID,
+            filename: filename,
+            fileSize: fileSize,
+            mediaType: mediaType,
+            subtypes: subtypes,
+            motionVideoImmichID: motionVideoImmichID,
+            cinematicSidecars: cinematicSidecars
+        )
+
         try queue.sync {
-            let sql = """
-                INSERT OR REPLACE INTO imported_assets
-                (icloud_uuid, immich_id, filename, file_size, media_type, imported_at, status, error_reason,
-                 is_live_photo, is_portrait, is_hdr, is_panorama, is_screenshot,
-                 is_cinematic, is_slomo, is_timelapse, is_spatial_video, is_proraw,
-                 has_paired_video, motion_video_immich_id, cinematic_sidecars)
-                VALUES (?, ?, ?, ?, ?, datetime('now'), 'imported', NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
             var stmt: OpaquePointer?
 
-            guard sqlite3_prepare_v2(db, sql, -1, &stmt, nil) == SQLITE_OK else {
+            guard sqlite3_prepare_v2(db, Tracker.markImportedSQL, -1, &stmt, nil) == SQLITE_OK else {
                 throw TrackerError.prepareFailed(String(cString: sqlite3_errmsg(db)))
             }
             defer { sqlite3_finalize(stmt) }
 
-            sqlite3_bind_text(stmt, 1, uuid, -1, SQLITE_TRANSIENT)
-            if let immichID = immichID {
-                sqlite3_bind_text(stmt, 2, immichID, -1, SQLITE_TRANSIENT)
-            } else {
-                sqlite3_bind_null(stmt, 2)
-            }
-            sqlite3_bind_text(stmt, 3, filename, -1, SQLITE_TRANSIENT)
-            sqlite3_bind_int64(stmt, 4, fileSize)
-            sqlite3_bind_text(stmt, 5, mediaType, -1, SQLITE_TRANSIENT)
-
-            // Bind subtype flags
-            sqlite3_bind_int(stmt, 6, subtypes.isLivePhoto ? 1 : 0)
-            sqlite3_bind_int(stmt, 7, subtypes.isPortrait ? 1 : 0)
-            sqlite3_bind_int(stmt, 8, subtypes.isHDR ? 1 : 0)
-            sqlite3_bind_int(stmt, 9, subtypes.isPanorama ? 1 : 0)
-            sqlite3_bind_int(stmt, 10, subtypes.isScreenshot ? 1 : 0)
-            sqlite3_bind_int(stmt, 11, subtypes.isCinematic ? 1 : 0)
-            sqlite3_bind_int(stmt, 12, subtypes.isSlomo ? 1 : 0)
-            sqlite3_bind_int(stmt, 13, subtypes.isTimelapse ? 1 : 0)
-            sqlite3_bind_int(stmt, 14, subtypes.isSpatialVideo ? 1 : 0)
-            sqlite3_bind_int(stmt, 15, subtypes.isProRAW ? 1 : 0)
-            sqlite3_bind_int(stmt, 16, subtypes.hasPairedVideo ? 1 : 0)
+            bindImportRecord(record, to: stmt)
 
-            if let motionVideoImmichID = motionVideoImmichID {
-                sqlite3_bind_text(stmt, 17, motionVideoImmichID, -1, SQLITE_TRANSIENT)
-            } else {
-                sqlite3_bind_null(stmt, 17)
+            if sqlite3_step(stmt) != SQLITE_DONE {
+                throw TrackerError.execFailed(String(cString: sqlite3_errmsg(db)))
             }
+        }
+    }
 
-            if let sidecars = cinematicSidecars, !sidecars.isEmpty {
-                // Store as JSON array
-                if let jsonData = try? JSONSerialization.data(withJSONObject: sidecars),
-                   let jsonString = String(data: jsonData, encoding: .utf8) {
-                    sqlite3_bind_text(stmt, 18, jsonString, -1, SQLITE_TRANSIENT)
-                } else {
-                    sqlite3_bind_null(stmt, 18)
+    /// Mark many assets as imported in one transaction
+    /// Reuses a single prepared statement and commits once, instead of one commit per asset.
+    /// Either every record is written or none are.
+    /// - Parameter rebuildIndexes: Drop the secondary indexes for the load and rebuild each once
+    ///   at the end, instead of updating them row by row. Worth it for a large first-time seed;
+    ///   slower than the default for small batches into an already large table.
+    public func markImportedBatch(_ records: [ImportRecord], rebuildIndexes: Bool = false) throws {
+        guard !records.isEmpty else { return }
+
+        try queue.sync {
+            try inTransaction {
+                let indexes = rebuildIndexes ? secondaryIndexes(on: "imported_assets") : []
+                for index in indexes {
+                    try execute("DROP INDEX \"\(index.name)\"")
+                }
+
+                var stmt: OpaquePointer?
+
+                guard sqlite3_prepare_v2(db, Tracker.markImportedSQL, -1, &stmt, nil) == SQLITE_OK else {
+                    throw TrackerError.prepareFailed(String(cString: sqlite3_errmsg(db)))
+                }
+                defer { sqlite3_finalize(stmt) }
+
+                for record in records {
+                    bindImportRecord(record, to: stmt)
+
+                    if sqlite3_step(stmt) != SQLITE_DONE {
+                        throw TrackerError.execFailed(String(cString: sqlite3_errmsg(db)))
+                    }
+                    sqlite3_reset(stmt)
+                    sqlite3_clear_bindings(stmt)
                 }
+
+                for index in indexes {
+                    try execute(index.sql)
+                }
+            }
+        }
+    }
+
+    /// Name and CREATE statement of each explicit index on a table - caller must already be on `queue`
+    /// The primary key's automatic index has no SQL and is left out; upserts depend on it.
+    private func secondaryIndexes(on table: String) -> [(name: String, sql: String)] {
+        let sql = "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL"
+        var stmt: OpaquePointer?
+        var indexes: [(name: String, sql: String)] = []
+
+        guard sqlite3_prepare_v2(db, sql, -1, &stmt, nil) == SQLITE_OK else {
+            return indexes
+        }
+        defer { sqlite3_finalize(stmt) }
+
+        sqlite3_bind_text(stmt, 1, table, -1, SQLITE_TRANSIENT)
+        while sqlite3_step(stmt) == SQLITE_ROW {
+            guard let name = sqlite3_column_text(stmt, 0),
+                  let createSQL = sqlite3_column_text(stmt, 1) else { continue }
+            indexes.append((String(cString: name), String(cString: createSQL)))
+        }
+        return indexes
+    }
+
+    private func bindImportRecord(_ record: ImportRecord, to stmt: OpaquePointer?) {
+        sqlite3_bind_text(stmt, 1, record.uuid, -1, SQLITE_TRANSIENT)
+        if let immichID = record.immichID {
+            sqlite3_bind_text(stmt, 2, immichID, -1, SQLITE_TRANSIENT)
+        } else {
+            sqlite3_bind_null(stmt, 2)
+        }
+        sqlite3_bind_text(stmt, 3, record.filename, -1, SQLITE_TRANSIENT)
+        sqlite3_bind_int64(stmt, 4, record.fileSize)
+        sqlite3_bind_text(stmt, 5, record.mediaType, -1, SQLITE_TRANSIENT)
+
+        // Bind subtype flags
+        let subtypes = record.subtypes
+        sqlite3_bind_int(stmt, 6, subtypes.isLivePhoto ? 1 : 0)
+        sqlite3_bind_int(stmt, 7, subtypes.isPortrait ? 1 : 0)
+        sqlite3_bind_int(stmt, 8, subtypes.isHDR ? 1 : 0)
+        sqlite3_bind_int(stmt, 9, subtypes.isPanorama ? 1 : 0)
+        sqlite3_bind_int(stmt, 10, subtypes.isScreenshot ? 1 : 0)
+        sqlite3_bind_int(stmt, 11, subtypes.isCinematic ? 1 : 0)
+        sqlite3_bind_int(stmt, 12, subtypes.isSlomo ? 1 : 0)
+        sqlite3_bind_int(stmt, 13, subtypes.isTimelapse ? 1 : 0)
+        sqlite3_bind_int(stmt, 14, subtypes.isSpatialVideo ? 1 : 0)
+        sqlite3_bind_int(stmt, 15, subtypes.isProRAW ? 1 : 0)
+        sqlite3_bind_int(stmt, 16, subtypes.hasPairedVideo ? 1 : 0)
+
+        if let motionVideoImmichID = record.motionVideoImmichID {
+            sqlite3_bind_text(stmt, 17, motionVideoImmichID, -1, SQLITE_TRANSIENT)
+        } else {
+            sqlite3_bind_null(stmt, 17)
+        }
+
+        if let sidecars = record.cinematicSidecars, !sidecars.isEmpty {
+            // Store as JSON array
+            if let jsonData = try? JSONSerialization.data(withJSONObject: sidecars),
+               let jsonString = String(data: jsonData, encoding: .utf8) {
+                sqlite3_bind_text(stmt, 18, jsonString, -1, SQLITE_TRANSIENT)
             } else {
                 sqlite3_bind_null(stmt, 18)
             }
+        } else {
+            sqlite3_bind_null(stmt, 18)
+        }
+    }
 
-            if sqlite3_step(stmt) != SQLITE_DONE {
-                throw TrackerError.execFailed(String(cString: sqlite3_errmsg(db)))
-            }
+    /// Run `body` inside one write transaction, rolling back if it throws - caller must already be on `queue`
+    private func inTransaction(_ body: () throws -> Void) throws {
+        try execute("BEGIN IMMEDIATE")
+        do {
+            try body()
+            try execute("COMMIT")
+        } catch {
+            sqlite3_exec(db, "ROLLBACK", nil, nil, nil)
+            throw error
+        }
+    }
+
+    /// Run a statement with no results - caller must already be on `queue`
+    private func execute(_ sql: String) throws {
+        var errMsg: UnsafeMutablePointer<CChar>?
+        if sqlite3_exec(db, sql, nil, nil, &errMsg) != SQLITE_OK {
+            let error = errMsg.map { String(cString: $0) } ?? "Unknown error"
+            sqlite3_free(errMsg)
+            throw TrackerError.execFailed(error)
         }
     }
 
@@ -442,32 +621,29 @@ public final class Tracker: @unchecked Sendable {
     }
 
     public func getStats() -> (total: Int, photos: Int, videos: Int, totalBytes: Int64) {
-        var total = 0
-        var photos = 0
-        var videos = 0
-        var totalBytes: Int64 = 0
-
-        // Total count
-        if let count = querySingleInt("SELECT COUNT(*) FROM imported_assets") {
-            total = count
-        }
-
-        // Photos count
-        if let count = querySingleInt("SELECT COUNT(*) FROM imported_assets WHERE media_type = 'photo'") {
-            photos = count
-        }
+        queue.sync {
+            // One pass over the table for every figure
+            let sql = """
+                SELECT COUNT(*),
+                       SUM(media_type = 'photo'),
+                       SUM(media_type = 'video'),
+                       SUM(file_size)
+                FROM imported_assets
+            """
+            var stmt: OpaquePointer?
+            guard sqlite3_prepare_v2(db, sql, -1, &stmt, nil) == SQLITE_OK else { return (0, 0, 0, 0) }
+            defer { sqlite3_finalize(stmt) }
 
-        // Videos count
-        if let count = querySingleInt("SELECT COUNT(*) FROM imported_assets WHERE media_type = 'video'") {
-            videos = count
-        }
+            guard sqlite3_step(stmt) == SQLITE_ROW else { return (0, 0, 0, 0) }
 
-        // Total size
-        if let size = querySingleInt64("SELECT SUM(file_size) FROM imported_assets") {
-            totalBytes = size
+            // SUM over an empty table is NULL, which reads back as 0
+            return (
+                Int(sqlite3_column_int64(stmt, 0)),
+                Int(sqlite3_column_int64(stmt, 1)),
+                Int(sqlite3_column_int64(stmt, 2)),
+                sqlite3_column_int64(stmt, 3)
+            )
         }
-
-        return (total, photos, videos, totalBytes)
     }
 
     public func getImmichIDForUUID(_ uuid: String) -> String? {
@@ -502,19 +678,6 @@ public final class Tracker: @unchecked Sendable {
         }
     }
 
-    private func querySingleInt64(_ sql: String) -> Int64? {
-        queue.sync {
-            var stmt: OpaquePointer?
-            guard sqlite3_prepare_v2(db, sql, -1, &stmt, nil) == SQLITE_OK else { return nil }
-            defer { sqlite3_finalize(stmt) }
-
-            if sqlite3_step(stmt) == SQLITE_ROW {
-                return sqlite3_column_int64(stmt, 0)
-            }
-            return nil
-        }
-    }
-
     /// Mark an asset as archived (deleted from Photos, kept in Immich)
     public func markArchived(uuid: String) throws {
         try queue.sync {
@@ -576,6 +739,46 @@ public final class Tracker: @unchecked Sendable {
         }
     }
 
+    /// Tracker fields cleanup checks for each asset
+    public struct CleanupInfo: Sendable {
+        public let immichID: String?
+        public let isArchived: Bool
+        public let hasPairedVideo: Bool          // is_live_photo or has_paired_video
+        public let hasMotionVideoBackup: Bool    // Same rule as hasMotionVideoBackup(uuid:)
+    }
+
+    /// Load cleanup fields for every tracked asset in one query
+    /// Cleanup visits the whole tracker, so this replaces several per-UUID lookups per asset.
+    public func getCleanupInfo() -> [String: CleanupInfo] {
+        queue.sync {
+            var results: [String: CleanupInfo] = [:]
+            let sql = """
+                SELECT icloud_uuid, immich_id, archived, is_live_photo, has_paired_video, motion_video_immich_id
+                FROM imported_assets
+            """
+            var stmt: OpaquePointer?
+
+            guard sqlite3_prepare_v2(db, sql, -1, &stmt, nil) == SQLITE_OK else {
+                return results
+            }
+            defer { sqlite3_finalize(stmt) }
+
+            while sqlite3_step(stmt) == SQLITE_ROW {
+                guard let uuidCStr = sqlite3_column_text(stmt, 0) else { continue }
+
+                let hasPairedVideo = sqlite3_column_int(stmt, 3) == 1 || sqlite3_column_int(stmt, 4) == 1
+                results[String(cString: uuidCStr)] = CleanupInfo(
+                    immichID: sqlite3_column_text(stmt, 1).map { String(cString: $0) },
+                    isArchived: sqlite3_column_int(stmt, 2) == 1,
+                    hasPairedVideo: hasPairedVideo,
+                    hasMotionVideoBackup: hasPairedVideo && sqlite3_column_type(stmt, 5) != SQLITE_NULL
+                )
+            }
+
+            return results
+        }
+    }
+
     /// Remove an asset from tracking (when deleted from both Photos and Immich)
     public func removeAsset(uuid: String) throws {
         try queue.sync {
@@ -865,43 +1068,33 @@ public final class Tracker: @unchecked Sendable {
         }
     }
 
+    private static let updateSubtypesSQL = """
+        UPDATE imported_assets SET
+            is_live_photo = ?,
+            is_portrait = ?,
+            is_hdr = ?,
+            is_panorama = ?,
+            is_screenshot = ?,
+            is_cinematic = ?,
+            is_slomo = ?,
+            is_timelapse = ?,
+            is_spatial_video = ?,
+            is_proraw = ?,
+            has_paired_video = ?
+        WHERE icloud_uuid = ?
+    """
+
     /// Update all subtype flags for an asset (preserves other data like immich_id, filename, etc.)
     public func updateSubtypes(uuid: String, subtypes: AssetSubtypes) throws {
         try queue.sync {
-            let sql = """
-                UPDATE imported_assets SET
-                    is_live_photo = ?,
-                    is_portrait = ?,
-                    is_hdr = ?,
-                    is_panorama = ?,
-                    is_screenshot = ?,
-                    is_cinematic = ?,
-                    is_slomo = ?,
-                    is_timelapse = ?,
-                    is_spatial_video = ?,
-                    is_proraw = ?,
-                    has_paired_video = ?
-                WHERE icloud_uuid = ?
-            """
             var stmt: OpaquePointer?
 
-            guard sqlite3_prepare_v2(db, sql, -1, &stmt, nil) == SQLITE_OK else {
+            guard sqlite3_prepare_v2(db, Tracker.updateSubtypesSQL, -1, &stmt, nil) == SQLITE_OK else {
                 throw TrackerError.prepareFailed(String(cString: sqlite3_errmsg(db)))
             }
             defer { sqlite3_finalize(stmt) }
 
-            sqlite3_bind_int(stmt, 1, subtypes.isLivePhoto ? 1 : 0)
-            sqlite3_bind_int(stmt, 2, subtypes.isPortrait ? 1 : 0)
-            sqlite3_bind_int(stmt, 3, subtypes.isHDR ? 1 : 0)
-            sqlite3_bind_int(stmt, 4, subtypes.isPanorama ? 1 : 0)
-            sqlite3_bind_int(stmt, 5, subtypes.isScreenshot ? 1 : 0)
-            sqlite3_bind_int(stmt, 6, subtypes.isCinematic ? 1 : 0)
-            sqlite3_bind_int(stmt, 7, subtypes.isSlomo ? 1 : 0)
-            sqlite3_bind_int(stmt, 8, subtypes.isTimelapse ? 1 : 0)
-            sqlite3_bind_int(stmt, 9, subtypes.isSpatialVideo ? 1 : 0)
-            sqlite3_bind_int(stmt, 10, subtypes.isProRAW ? 1 : 0)
-            sqlite3_bind_int(stmt, 11, subtypes.hasPairedVideo ? 1 : 0)
-            sqlite3_bind_text(stmt, 12, uuid, -1, SQLITE_TRANSIENT)
+            bindSubtypes(subtypes, uuid: uuid, to: stmt)
 
             if sqlite3_step(stmt) != SQLITE_DONE {
                 throw TrackerError.execFailed(String(cString: sqlite3_errmsg(db)))
@@ -909,6 +1102,48 @@ public final class Tracker: @unchecked Sendable {
         }
     }
 
+    /// Update subtype columns for many assets in one transaction
+    /// Either every update is applied or none are.
+    public func updateSubtypesBatch(_ updates: [(uuid: String, subtypes: AssetSubtypes)]) throws {
+        guard !updates.isEmpty else { return }
+
+        try queue.sync {
+            try inTransaction {
+                var stmt: OpaquePointer?
+
+                guard sqlite3_prepare_v2(db, Tracker.updateSubtypesSQL, -1, &stmt, nil) == SQLITE_OK else {
+                    throw TrackerError.prepareFailed(String(cString: sqlite3_errmsg(db)))
+                }
+                defer { sqlite3_finalize(stmt) }
+
+                for update in updates {
+                    bindSubtypes(update.subtypes, uuid: update.uuid, to: stmt)
+
+                    if sqlite3_step(stmt) != SQLITE_DONE {
+                        throw TrackerError.execFailed(String(cString: sqlite3_errmsg(db)))
+                    }
+                    sqlite3_reset(stmt)
+                    sqlite3_clear_bindings(stmt)
+                }
+            }
+        }
+    }
+
+    private func bindSubtypes(_ subtypes: AssetSubtypes, uuid: String, to stmt: OpaquePointer?) {
+        sqlite3_bind_int(stmt, 1, subtypes.isLivePhoto ? 1 : 0)
+        sqlite3_bind_int(stmt, 2, subtypes.isPortrait ? 1 : 0)
+        sqlite3_bind_int(stmt, 3, subtypes.isHDR ? 1 : 0)
+        sqlite3_bind_int(stmt, 4, subtypes.isPanorama ? 1 : 0)
+        sqlite3_bind_int(stmt, 5, subtypes.isScreenshot ? 1 : 0)
+        sqlite3_bind_int(stmt, 6, subtypes.isCinematic ? 1 : 0)
+        sqlite3_bind_int(stmt, 7, subtypes.isSlomo ? 1 : 0)
+        sqlite3_bind_int(stmt, 8, subtypes.isTimelapse ? 1 : 0)
+        sqlite3_bind_int(stmt, 9, subtypes.isSpatialVideo ? 1 : 0)
+        sqlite3_bind_int(stmt, 10, subtypes.isProRAW ? 1 : 0)
+        sqlite3_bind_int(stmt, 11, subtypes.hasPairedVideo ? 1 : 0)
+        sqlite3_bind_text(stmt, 12, uuid, -1, SQLITE_TRANSIENT)
+    }
+
     // MARK: - Cinematic Video Support
 
     /// Check if an asset is a Cinematic video
@@ -1115,8 +1350,7 @@ public final class Tracker: @unchecked Sendable {
             sqlite3_bind_text(stmt, 4, reason, -1, SQLITE_TRANSIENT)
 
             if let createdAt = createdAt {
-                let formatter = ISO8601DateFormatter()
-                sqlite3_bind_text(stmt, 5, formatter.string(from: createdAt), -1, SQLITE_TRANSIENT)
+                sqlite3_bind_text(stmt, 5, createdAt.formatted(createdAtFormat), -1, SQLITE_TRANSIENT)
             } else {
                 sqlite3_bind_null(stmt, 5)
             }
@@ -1154,8 +1388,7 @@ public final class Tracker: @unchecked Sendable {
             sqlite3_bind_text(stmt, 4, reason, -1, SQLITE_TRANSIENT)
 
             if let createdAt = createdAt {
-                let formatter = ISO8601DateFormatter()
-                sqlite3_bind_text(stmt, 5, formatter.string(from: createdAt), -1, SQLITE_TRANSIENT)
+                sqlite3_bind_text(stmt, 5, createdAt.formatted(createdAtFormat), -1, SQLITE_TRANSIENT)
             } else {
                 sqlite3_bind_null(stmt, 5)
             }
@@ -1184,8 +1417,6 @@ public final class Tracker: @unchecked Sendable {
             }
             defer { sqlite3_finalize(stmt) }
 
-            let dateFormatter = ISO8601DateFormatter()
-
             while sqlite3_step(stmt) == SQLITE_ROW {
                 guard let uuidCStr = sqlite3_column_text(stmt, 0) else { continue }
                 let uuid = String(cString: uuidCStr)
@@ -1197,18 +1428,13 @@ public final class Tracker: @unchecked Sendable {
 
                 var createdAt: Date? = nil
                 if let createdAtCStr = sqlite3_column_text(stmt, 5) {
-                    createdAt = dateFormatter.date(from: String(cString: createdAtCStr))
+                    createdAt = try? Date(String(cString: createdAtCStr), strategy: createdAtFormat)
                 }
 
                 var recordedAt = Date()
-                if let recordedAtCStr = sqlite3_column_text(stmt, 6) {
-                    // Parse SQLite datetime format
-                    let sqlFormatter = DateFormatter()
-                    sqlFormatter.dateFormat = "yyyy-MM-dd HH:mm:ss"
-                    sqlFormatter.timeZone = TimeZone(identifier: "UTC")
-                    if let parsed = sqlFormatter.date(from: String(cString: recordedAtCStr)) {
-                        recordedAt = parsed
-                    }
+                if let recordedAtCStr = sqlite3_column_text(stmt, 6),
+                   let parsed = sqliteTimestamp(recordedAtCStr) {
+                    recordedAt = parsed
                 }
 
                 results.append(ProblemAsset(
@@ -1345,10 +1571,6 @@ public final class Tracker: @unchecked Sendable {
             }
             defer { sqlite3_finalize(stmt) }
 
-            let sqlFormatter = DateFormatter()
-            sqlFormatter.dateFormat = "yyyy-MM-dd HH:mm:ss"
-            sqlFormatter.timeZone = TimeZone(identifier: "UTC")
-
             while sqlite3_step(stmt) == SQLITE_ROW {
                 let id = sqlite3_column_int64(stmt, 0)
                 let name = sqlite3_column_text(stmt, 1).map { String(cString: $0) } ?? ""
@@ -1358,13 +1580,13 @@ public final class Tracker: @unchecked Sendable {
 
                 var createdAt = Date()
                 if let createdAtCStr = sqlite3_column_text(stmt, 5) {
-                    createdAt = sqlFormatter.date(from: String(cString: createdAtCStr)) ?? Date()
+                    createdAt = sqliteTimestamp(createdAtCStr) ?? Date()
                 }
 
                 var lastBackupAt: Date? = nil
                 if sqlite3_column_type(stmt, 6) != SQLITE_NULL,
                    let lastBackupCStr = sqlite3_column_text(stmt, 6) {
-                    lastBackupAt = sqlFormatter.date(from: String(cString: lastBackupCStr))
+                    lastBackupAt = sqliteTimestamp(lastBackupCStr)
                 }
 
                 results.append(BackupDestination(
@@ -1399,10 +1621,6 @@ public final class Tracker: @unchecked Sendable {
 
             sqlite3_bind_text(stmt, 1, name, -1, SQLITE_TRANSIENT)
 
-            let sqlFormatter = DateFormatter()
-            sqlFormatter.dateFormat = "yyyy-MM-dd HH:mm:ss"
-            sqlFormatter.timeZone = TimeZone(identifier: "UTC")
-
             if sqlite3_step(stmt) == SQLITE_ROW {
                 let id = sqlite3_column_int64(stmt, 0)
                 let name = sqlite3_column_text(stmt, 1).map { String(cString: $0) } ?? ""
@@ -1412,13 +1630,13 @@ public final class Tracker: @unchecked Sendable {
 
                 var createdAt = Date()
                 if let createdAtCStr = sqlite3_column_text(stmt, 5) {
-                    createdAt = sqlFormatter.date(from: String(cString: createdAtCStr)) ?? Date()
+                    createdAt = sqliteTimestamp(createdAtCStr) ?? Date()
                 }
 
                 var lastBackupAt: Date? = nil
                 if sqlite3_column_type(stmt, 6) != SQLITE_NULL,
                    let lastBackupCStr = sqlite3_column_text(stmt, 6) {
-                    lastBackupAt = sqlFormatter.date(from: String(cString: lastBackupCStr))
+                    lastBackupAt = sqliteTimestamp(lastBackupCStr)
                 }
 
                 return BackupDestination(
@@ -1830,10 +2048,6 @@ public final class Tracker: @unchecked Sendable {
     private func parseBackupJob(from stmt: OpaquePointer?) -> BackupJob? {
         guard let stmt = stmt else { return nil }
 
-        let sqlFormatter = DateFormatter()
-        sqlFormatter.dateFormat = "yyyy-MM-dd HH:mm:ss"
-        sqlFormatter.timeZone = TimeZone(identifier: "UTC")
-
         let id = sqlite3_column_int64(stmt, 0)
         let destinationId = sqlite3_column_int64(stmt, 1)
         let sourcePath = sqlite3_column_text(stmt, 2).map { String(cString: $0) } ?? ""
@@ -1848,18 +2062,18 @@ public final class Tracker: @unchecked Sendable {
         var startedAt: Date? = nil
         if sqlite3_column_type(stmt, 9) != SQLITE_NULL,
            let cStr = sqlite3_column_text(stmt, 9) {
-            startedAt = sqlFormatter.date(from: String(cString: cStr))
+            startedAt = sqliteTimestamp(cStr)
         }
 
         var completedAt: Date? = nil
         if sqlite3_column_type(stmt, 10) != SQLITE_NULL,
            let cStr = sqlite3_column_text(stmt, 10) {
-            completedAt = sqlFormatter.date(from: String(cString: cStr))
+            completedAt = sqliteTimestamp(cStr)
         }
 
         var lastUpdate = Date()
         if let cStr = sqlite3_column_text(stmt, 11) {
-            lastUpdate = sqlFormatter.date(from: String(cString: cStr)) ?? Date()
+            lastUpdate = sqliteTimestamp(cStr) ?? Date()
         }
 
         var errorMessage: String? = nil
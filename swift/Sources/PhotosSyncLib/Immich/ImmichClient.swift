@@ -1,3 +1,4 @@
+import CryptoKit
 import Foundation
 
 /// Client for Immich API
@@ -5,6 +6,7 @@ public final class ImmichClient: Sendable {
     private let baseURL: String
     private let apiKey: String
     private let session: URLSession
+    private let ownsSession: Bool
     
     public struct UploadResult: Sendable {
         public let success: Bool
@@ -13,21 +15,47 @@ public final class ImmichClient: Sendable {
         public let error: String?
     }
     
-    public init(baseURL: String, apiKey: String, session: URLSession = .shared) {
+    public init(baseURL: String, apiKey: String, session: URLSession? = nil) {
         self.baseURL = baseURL.hasSuffix("/") ? String(baseURL.dropLast()) : baseURL
         self.apiKey = apiKey
-        self.session = session
+        self.session = session ?? ImmichClient.makeSession()
+        self.ownsSession = session == nil
+    }
+    
+    deinit {
+        if ownsSession {
+            session.finishTasksAndInvalidate()
+        }
+    }
+    
+    /// Create a session dedicated to Immich traffic
+    /// Keeps enough keep-alive connections open for concurrent uploads and skips
+    /// the response cache, which only holds on to asset listings we never re-read
+    public static func makeSession(maxConnectionsPerHost: Int = 20) -> URLSession {
+        let configuration = URLSessionConfiguration.default
+        configuration.httpMaximumConnectionsPerHost = maxConnectionsPerHost
+        configuration.requestCachePolicy = .reloadIgnoringLocalCacheData
+        configuration.urlCache = nil
+        return URLSession(configuration: configuration)
     }
     
     /// Test connection to Immich
-    public func ping() async -> Bool {
+    /// Sends a HEAD with a short timeout so an unreachable server fails fast instead of
+    /// hanging for the session default; falls back to GET if HEAD isn't allowed.
+    public func ping(timeout: TimeInterval = 5) async -> Bool {
         guard let url = URL(string: "\(baseURL)/api/server/ping") else { return false }
         
         var request = URLRequest(url: url)
+        request.httpMethod = "HEAD"
+        request.timeoutInterval = timeout
         request.setValue(apiKey, forHTTPHeaderField: "x-api-key")
         
         do {
-            let (_, response) = try await session.data(for: request)
+            var (_, response) = try await session.data(for: request)
+            if (response as? HTTPURLResponse)?.statusCode == 405 {
+                request.httpMethod = "GET"
+                (_, response) = try await session.data(for: request)
+            }
             return (response as? HTTPURLResponse)?.statusCode == 200
         } catch {
             return false
@@ -37,79 +65,91 @@ public final class ImmichClient: Sendable {
     /// Upload an asset to Immich
     /// - Parameters:
     ///   - livePhotoVideoId: For Live Photos, the Immich ID of the already-uploaded video component
+    ///   - checkDuplicate: Hash the file and ask Immich whether it already has it before sending
+    ///     any bytes. A match is reported as a duplicate, exactly as if the upload had happened.
     public func uploadAsset(
         fileURL: URL,
         deviceAssetID: String,
         deviceID: String = "photos-sync",
         fileCreatedAt: Date?,
         fileModifiedAt: Date?,
-        livePhotoVideoId: String? = nil
+        livePhotoVideoId: String? = nil,
+        checkDuplicate: Bool = false
     ) async -> UploadResult {
         guard let url = URL(string: "\(baseURL)/api/assets") else {
             return UploadResult(success: false, assetID: nil, duplicate: false, error: "Invalid URL")
         }
         
-        // Read file data
-        guard let fileData = try? Data(contentsOf: fileURL) else {
+        // Open the file once, up front: a missing or unreadable file fails before any network
+        // work, and the duplicate check hashes through the same handle the upload streams from
+        guard let fileHandle = try? FileHandle(forReadingFrom: fileURL) else {
             return UploadResult(success: false, assetID: nil, duplicate: false, error: "Could not read file")
         }
         
-        let filename = fileURL.lastPathComponent
-        let mimeType = mimeTypeForFile(filename)
-        
-        // Build multipart form data
-        let boundary = UUID().uuidString
-        var body = Data()
+        if checkDuplicate, let checksum = ImmichClient.checksum(of: fileHandle) {
+            let existing = await checkDuplicates([deviceAssetID: checksum])
+            if let assetID = existing[deviceAssetID] {
+                try? fileHandle.close()
+                return UploadResult(success: true, assetID: assetID, duplicate: true, error: nil)
+            }
+        }
         
-        // Add deviceAssetId field
-        body.append("--\(boundary)\r\n".data(using: .utf8)!)
-        body.append("Content-Disposition: form-data; name=\"deviceAssetId\"\r\n\r\n".data(using: .utf8)!)
-        body.append("\(deviceAssetID)\r\n".data(using: .utf8)!)
+        guard let fileSize = try? fileHandle.seekToEnd(),
+              (try? fileHandle.seek(toOffset: 0)) != nil else {
+            try? fileHandle.close()
+            return UploadResult(success: false, assetID: nil, duplicate: false, error: "Could not read file")
+        }
         
-        // Add deviceId field
-        body.append("--\(boundary)\r\n".data(using: .utf8)!)
-        body.append("Content-Disposition: form-data; name=\"deviceId\"\r\n\r\n".data(using: .utf8)!)
-        body.append("\(deviceID)\r\n".data(using: .utf8)!)
+        let filename = fileURL.lastPathComponent
+        let mimeType = mimeTypeForFile(filename)
         
-        // Add fileCreatedAt if available
+        // Form fields sent ahead of the file part
+        var fields: [(String, String)] = [
+            ("deviceAssetId", deviceAssetID),
+            ("deviceId", deviceID),
+        ]
         if let created = fileCreatedAt {
-            body.append("--\(boundary)\r\n".data(using: .utf8)!)
-            body.append("Content-Disposition: form-data; name=\"fileCreatedAt\"\r\n\r\n".data(using: .utf8)!)
-            body.append("\(formatDate(created))\r\n".data(using: .utf8)!)
+            fields.append(("fileCreatedAt", formatDate(created)))
         }
-        
-        // Add fileModifiedAt if available
         if let modified = fileModifiedAt {
-            body.append("--\(boundary)\r\n".data(using: .utf8)!)
-            body.append("Content-Disposition: form-data; name=\"fileModifiedAt\"\r\n\r\n".data(using: .utf8)!)
-            body.append("\(formatDate(modified))\r\n".data(using: .utf8)!)
+            fields.append(("fileModifiedAt", formatDate(modified)))
         }
-        
         // Add livePhotoVideoId if this is a Live Photo image being linked to its video
         if let livePhotoVideoId = livePhotoVideoId {
-            body.append("--\(boundary)\r\n".data(using: .utf8)!)
-            body.append("Content-Disposition: form-data; name=\"livePhotoVideoId\"\r\n\r\n".data(using: .utf8)!)
-            body.append("\(livePhotoVideoId)\r\n".data(using: .utf8)!)
+            fields.append(("livePhotoVideoId", livePhotoVideoId))
         }
         
-        // Add file data
-        body.append("--\(boundary)\r\n".data(using: .utf8)!)
-        body.append("Content-Disposition: form-data; name=\"assetData\"; filename=\"\(filename)\"\r\n".data(using: .utf8)!)
-        body.append("Content-Type: \(mimeType)\r\n\r\n".data(using: .utf8)!)
-        body.append(fileData)
-        body.append("\r\n".data(using: .utf8)!)
+        // Build multipart form data
+        let boundary = UUID().uuidString
+        var header = ""
+        for (name, value) in fields {
+            header += "--\(boundary)\r\n"
+            header += "Content-Disposition: form-data; name=\"\(name)\"\r\n\r\n"
+            header += "\(value)\r\n"
+        }
+        header += "--\(boundary)\r\n"
+        header += "Content-Disposition: form-data; name=\"assetData\"; filename=\"\(filename)\"\r\n"
+        header += "Content-Type: \(mimeType)\r\n\r\n"
         
-        // End boundary
-        body.append("--\(boundary)--\r\n".data(using: .utf8)!)
+        // The file is streamed from the staged copy straight into the request body,
+        // so it is neither held in memory nor copied to a second file
+        let body = MultipartBody(
+            header: Data(header.utf8),
+            fileURL: fileURL,
+            trailer: Data("\r\n--\(boundary)--\r\n".utf8)
+        )
         
         var request = URLRequest(url: url)
         request.httpMethod = "POST"
         request.setValue(apiKey, forHTTPHeaderField: "x-api-key")
         request.setValue("multipart/form-data; boundary=\(boundary)", forHTTPHeaderField: "Content-Type")
-        request.httpBody = body
+        request.setValue(String(body.contentLength(fileSize: fileSize)), forHTTPHeaderField: "Content-Length")
+        request.httpBodyStream = body.makeStream(file: fileHandle)
         
         do {
-            let (data, response) = try await session.data(for: request)
+            // A stream can only be read once; the delegate supplies a fresh one if URLSession
+            // has to resend the body (redirect, auth challenge, retry on a stale keep-alive)
+            let (data, response) = try await session.data(for: request, delegate: UploadBodyProvider(body: body))
             
             guard let httpResponse = response as? HTTPURLResponse else {
                 return UploadResult(success: false, assetID: nil, duplicate: false, error: "Invalid response")
@@ -132,38 +172,92 @@ public final class ImmichClient: Sendable {
         }
     }
     
+    /// SHA-1 of a file as lowercase hex - the checksum Immich stores for every asset
+    /// Reads in 1 MiB chunks so large videos are never loaded whole.
+    public static func checksum(forFileAt fileURL: URL) -> String? {
+        guard let handle = try? FileHandle(forReadingFrom: fileURL) else { return nil }
+        defer { try? handle.close() }
+        
+        return checksum(of: handle)
+    }
+    
+    /// SHA-1 of everything from the handle's current offset to the end of the file
+    /// Reads straight into one reused buffer instead of allocating a new Data for every chunk.
+    private static func checksum(of handle: FileHandle) -> String? {
+        let buffer = UnsafeMutableRawBufferPointer.allocate(byteCount: 1 << 20, alignment: 1)
+        defer { buffer.deallocate() }
+        
+        var hasher = Insecure.SHA1()
+        while true {
+            let count = read(handle.fileDescriptor, buffer.baseAddress, buffer.count)
+            if count == 0 { break }
+            if count < 0 {
+                if errno == EINTR { continue }
+                return nil
+            }
+            hasher.update(bufferPointer: UnsafeRawBufferPointer(rebasing: buffer[..<count]))
+        }
+        return hasher.finalize().map { String(format: "%02x", $0) }.joined()
+    }
+    
+    /// Ask Immich which of these files it already has, without uploading them
+    /// - Parameter checksums: Caller-chosen ID (e.g. deviceAssetId) to SHA-1 checksum
+    /// - Returns: Caller ID to existing Immich asset ID, for duplicates only. Empty on any
+    ///   error, so callers simply fall back to uploading.
+    public func checkDuplicates(_ checksums: [String: String]) async -> [String: String] {
+        guard !checksums.isEmpty,
+              let url = URL(string: "\(baseURL)/api/assets/bulk-upload-check") else { return [:] }
+        
+        var request = URLRequest(url: url)
+        request.httpMethod = "POST"
+        request.setValue(apiKey, forHTTPHeaderField: "x-api-key")
+        request.setValue("application/json", forHTTPHeaderField: "Content-Type")
+        
+        let body: [String: Any] = [
+            "assets": checksums.map { ["id": $0.key, "checksum": $0.value] }
+        ]
+        request.httpBody = try? JSONSerialization.data(withJSONObject: body)
+        
+        do {
+            let (data, response) = try await session.data(for: request)
+            guard (response as? HTTPURLResponse)?.statusCode == 200,
+                  let json = try? JSONSerialization.jsonObject(with: data) as? [String: Any],
+                  let results = json["results"] as? [[String: Any]] else {
+                return [:]
+            }
+            
+            var duplicates: [String: String] = [:]
+            for result in results {
+                guard result["action"] as? String == "reject",
+                      result["reason"] as? String == "duplicate",
+                      let id = result["id"] as? String,
+                      let assetID = result["assetId"] as? String else { continue }
+                duplicates[id] = assetID
+            }
+            return duplicates
+        } catch {
+            return [:]
+        }
+    }
+    
     /// Get all asset IDs from Immich (for cleanup comparison)
     public func getAllAssetIDs() async -> Set<String> {
-        var assetIDs = Set<String>()
-        var page = 1
         let pageSize = 1000
         
-        while true {
-            guard let url = URL(string: "\(baseURL)/api/assets?size=\(pageSize)&page=\(page)") else { break }
+        let ids: [String] = await fetchPages { page in
+            guard let url = URL(string: "\(self.baseURL)/api/assets?size=\(pageSize)&page=\(page)") else { return nil }
             
             var request = URLRequest(url: url)
-            request.setValue(apiKey, forHTTPHeaderField: "x-api-key")
+            request.setValue(self.apiKey, forHTTPHeaderField: "x-api-key")
             
-            do {
-                let (data, _) = try await session.data(for: request)
-                guard let json = try? JSONSerialization.jsonObject(with: data) as? [[String: Any]] else { break }
-                
-                if json.isEmpty { break }
-                
-                for asset in json {
-                    if let id = asset["id"] as? String {
-                        assetIDs.insert(id)
-                    }
-                }
-                
-                if json.count < pageSize { break }
-                page += 1
-            } catch {
-                break
-            }
+            guard let (data, _) = try? await self.session.data(for: request),
+                  let json = try? JSONSerialization.jsonObject(with: data) as? [[String: Any]] else { return nil }
+            
+            let ids = json.compactMap { $0["id"] as? String }
+            return (ids, json.count < pageSize)
         }
         
-        return assetIDs
+        return Set(ids)
     }
     
     public struct AssetInfo: Sendable {
@@ -176,16 +270,14 @@ public final class ImmichClient: Sendable {
     
     /// Get all assets from Immich with metadata (for syncing tracker)
     public func getAllAssets(deviceId: String? = "photos-sync", progress: ((Int) -> Void)? = nil) async -> [AssetInfo] {
-        var assets: [AssetInfo] = []
-        var page = 1
         let pageSize = 250  // Immich caps at 250 per page
         
-        while true {
-            guard let url = URL(string: "\(baseURL)/api/search/metadata") else { break }
+        return await fetchPages(progress: progress) { page in
+            guard let url = URL(string: "\(self.baseURL)/api/search/metadata") else { return nil }
             
             var request = URLRequest(url: url)
             request.httpMethod = "POST"
-            request.setValue(apiKey, forHTTPHeaderField: "x-api-key")
+            request.setValue(self.apiKey, forHTTPHeaderField: "x-api-key")
             request.setValue("application/json", forHTTPHeaderField: "Content-Type")
             
             var body: [String: Any] = [
@@ -197,52 +289,73 @@ public final class ImmichClient: Sendable {
             }
             request.httpBody = try? JSONSerialization.data(withJSONObject: body)
             
-            do {
-                let (data, _) = try await session.data(for: request)
-                guard let json = try? JSONSerialization.jsonObject(with: data) as? [String: Any],
-                      let assetsData = json["assets"] as? [String: Any],
-                      let items = assetsData["items"] as? [[String: Any]] else { break }
-                
-                if items.isEmpty { break }
-                
-                for item in items {
-                    if let id = item["id"] as? String,
-                       let deviceAssetId = item["deviceAssetId"] as? String {
-                        let filename = item["originalFileName"] as? String ?? ""
-                        let type = item["type"] as? String ?? "IMAGE"
-                        assets.append(AssetInfo(
-                            id: id,
-                            deviceAssetId: deviceAssetId,
-                            originalFileName: filename,
-                            type: type,
-                            fileSize: 0
-                        ))
-                    }
-                }
-                
-                progress?(assets.count)
-                
-                // Check if there's a next page (can be Int or String)
-                let hasNextPage: Bool
-                if let nextInt = assetsData["nextPage"] as? Int {
-                    hasNextPage = true
-                    _ = nextInt  // silence unused warning
-                } else if let nextStr = assetsData["nextPage"] as? String, !nextStr.isEmpty {
-                    hasNextPage = true
-                } else {
-                    hasNextPage = assetsData["nextPage"] != nil && !(assetsData["nextPage"] is NSNull)
+            guard let (data, _) = try? await self.session.data(for: request),
+                  let json = try? JSONSerialization.jsonObject(with: data) as? [String: Any],
+                  let assetsData = json["assets"] as? [String: Any],
+                  let items = assetsData["items"] as? [[String: Any]] else { return nil }
+            
+            let assets: [AssetInfo] = items.compactMap { item in
+                guard let id = item["id"] as? String,
+                      let deviceAssetId = item["deviceAssetId"] as? String else { return nil }
+                return AssetInfo(
+                    id: id,
+                    deviceAssetId: deviceAssetId,
+                    originalFileName: item["originalFileName"] as? String ?? "",
+                    type: item["type"] as? String ?? "IMAGE",
+                    fileSize: 0
+                )
+            }
+            
+            // nextPage is null on the last page (can be Int or String otherwise)
+            let nextPage = assetsData["nextPage"]
+            let hasNextPage: Bool
+            if let nextStr = nextPage as? String {
+                hasNextPage = !nextStr.isEmpty
+            } else {
+                hasNextPage = nextPage != nil && !(nextPage is NSNull)
+            }
+            
+            return (assets, items.isEmpty || !hasNextPage)
+        }
+    }
+    
+    /// Number of pages requested at once when walking a paginated listing
+    private static let pageConcurrency = 4
+    
+    /// Walk a paginated listing a few pages at a time instead of one round-trip per page
+    /// Neither listing endpoint reports a total up front, so pages are requested in waves and
+    /// the walk stops at the first page that is last, empty, or fails; anything fetched past
+    /// that point is dropped. Items come back in page order.
+    private func fetchPages<Item: Sendable>(
+        progress: ((Int) -> Void)? = nil,
+        fetch: @escaping @Sendable (Int) async -> (items: [Item], isLast: Bool)?
+    ) async -> [Item] {
+        var items: [Item] = []
+        var firstPage = 1
+        
+        while true {
+            let pages = firstPage..<(firstPage + Self.pageConcurrency)
+            let wave = await withTaskGroup(of: (Int, (items: [Item], isLast: Bool)?).self) { group in
+                for page in pages {
+                    group.addTask { (page, await fetch(page)) }
                 }
                 
-                if !hasNextPage {
-                    break
+                var results: [Int: (items: [Item], isLast: Bool)] = [:]
+                for await (page, result) in group {
+                    results[page] = result
                 }
-                page += 1
-            } catch {
-                break
+                return results
             }
+            
+            for page in pages {
+                guard let result = wave[page] else { return items }
+                items.append(contentsOf: result.items)
+                progress?(items.count)
+                if result.isLast || result.items.isEmpty { return items }
+            }
+            
+            firstPage = pages.upperBound
         }
-        
-        return assets
     }
     
     /// Check if an asset exists in Immich by device asset ID
@@ -357,39 +470,133 @@ public final class ImmichClient: Sendable {
         }
     }
     
+    /// Built once - formatDate runs for every field of every upload
+    private static let dateFormat = Date.ISO8601FormatStyle(includingFractionalSeconds: true)
+    
     private func formatDate(_ date: Date) -> String {
-        let formatter = ISO8601DateFormatter()
-        formatter.formatOptions = [.withInternetDateTime, .withFractionalSeconds]
-        return formatter.string(from: date)
+        date.formatted(Self.dateFormat)
     }
     
+    private static let mimeTypes: [String: String] = [
+        // Images
+        "jpg": "image/jpeg",
+        "jpeg": "image/jpeg",
+        "png": "image/png",
+        "gif": "image/gif",
+        "webp": "image/webp",
+        "heic": "image/heic",
+        "heif": "image/heif",
+        "tiff": "image/tiff",
+        "tif": "image/tiff",
+        "bmp": "image/bmp",
+        "dng": "image/dng",
+        "cr2": "image/x-canon-cr2",
+        "nef": "image/x-nikon-nef",
+        "arw": "image/x-sony-arw",
+        // Videos
+        "mp4": "video/mp4",
+        "mov": "video/quicktime",
+        "avi": "video/x-msvideo",
+        "mkv": "video/x-matroska",
+        "webm": "video/webm",
+        "m4v": "video/x-m4v",
+        "3gp": "video/3gpp",
+    ]
+    
     private func mimeTypeForFile(_ filename: String) -> String {
         let ext = (filename as NSString).pathExtension.lowercased()
-        let mimeTypes: [String: String] = [
-            // Images
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg",
-            "png": "image/png",
-            "gif": "image/gif",
-            "webp": "image/webp",
-            "heic": "image/heic",
-            "heif": "image/heif",
-            "tiff": "image/tiff",
-            "tif": "image/tiff",
-            "bmp": "image/bmp",
-            "dng": "image/dng",
-            "cr2": "image/x-canon-cr2",
-            "nef": "image/x-nikon-nef",
-            "arw": "image/x-sony-arw",
-            // Videos
-            "mp4": "video/mp4",
-            "mov": "video/quicktime",
-            "avi": "video/x-msvideo",
-            "mkv": "video/x-matroska",
-            "webm": "video/webm",
-            "m4v": "video/x-m4v",
-            "3gp": "video/3gpp",
-        ]
-        return mimeTypes[ext] ?? "application/octet-stream"
+        return Self.mimeTypes[ext] ?? "application/octet-stream"
+    }
+}
+
+/// A multipart upload body: form fields and file part header, the file itself, then the closing boundary
+struct MultipartBody: Sendable {
+    let header: Data
+    let fileURL: URL
+    let trailer: Data
+    
+    func contentLength(fileSize: UInt64) -> UInt64 {
+        UInt64(header.count) + fileSize + UInt64(trailer.count)
+    }
+    
+    /// A new stream over the whole body, reading from `file` if given, else reopening `fileURL`
+    func makeStream(file: FileHandle? = nil) -> InputStream? {
+        guard let file = file ?? (try? FileHandle(forReadingFrom: fileURL)) else { return nil }
+        return MultipartBodyStream(header: header, file: file, trailer: trailer).start()
+    }
+}
+
+/// Per-task delegate that hands URLSession a fresh body stream whenever it needs to send the
+/// upload again; without it a resend fails with NSURLErrorRequestBodyStreamExhausted
+final class UploadBodyProvider: NSObject, URLSessionTaskDelegate, Sendable {
+    private let body: MultipartBody
+    
+    init(body: MultipartBody) {
+        self.body = body
+    }
+    
+    func urlSession(_ session: URLSession, needNewBodyStreamForTask task: URLSessionTask) async -> InputStream? {
+        body.makeStream()
+    }
+}
+
+/// Feeds a multipart body to URLSession through a bound stream pair
+/// A background thread writes the header, the file in small chunks, then the trailer; the
+/// bound buffer applies back-pressure, so memory stays flat regardless of file size.
+private final class MultipartBodyStream: @unchecked Sendable {
+    private static let chunkSize = 64 * 1024
+    
+    private let header: Data
+    private let file: FileHandle
+    private let trailer: Data
+    private var output: OutputStream?
+    
+    init(header: Data, file: FileHandle, trailer: Data) {
+        self.header = header
+        self.file = file
+        self.trailer = trailer
+    }
+    
+    /// Start the writer thread and return the stream to hand to the request
+    func start() -> InputStream? {
+        var input: InputStream?
+        var output: OutputStream?
+        Stream.getBoundStreams(withBufferSize: Self.chunkSize, inputStream: &input, outputStream: &output)
+        self.output = output
+        
+        let thread = Thread { [self] in
+            pump()
+        }
+        thread.name = "ImmichClient.upload"
+        thread.start()
+        return input
+    }
+    
+    private func pump() {
+        defer { try? file.close() }
+        guard let output else { return }
+        output.open()
+        defer { output.close() }
+        
+        guard write(header, to: output) else { return }
+        while let chunk = try? file.read(upToCount: Self.chunkSize), !chunk.isEmpty {
+            // A failed write means the reader closed the stream (request finished or failed)
+            guard write(chunk, to: output) else { return }
+        }
+        _ = write(trailer, to: output)
+    }
+    
+    /// Blocking write of the whole buffer; returns false if the stream was closed
+    private func write(_ data: Data, to output: OutputStream) -> Bool {
+        data.withUnsafeBytes { raw in
+            guard let base = raw.bindMemory(to: UInt8.self).baseAddress else { return true }
+            var offset = 0
+            while offset < data.count {
+                let written = output.write(base + offset, maxLength: data.count - offset)
+                if written <= 0 { return false }
+                offset += written
+            }
+            return true
+        }
     }
 }
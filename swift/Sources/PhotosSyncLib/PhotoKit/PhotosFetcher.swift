@@ -27,6 +27,9 @@ public final class PhotosFetcher: Sendable {
         
         // Key field - from actual resource check, not subtype
         public let hasPairedVideo: Bool    // Has .pairedVideo resource (type 9)
+        
+        /// Tracker media_type ("photo", "video", ...)
+        public var mediaTypeName: String { PhotosFetcher.mediaTypeString(mediaType) }
     }
     
     public struct DownloadResult: Sendable {
@@ -108,19 +111,52 @@ public final class PhotosFetcher: Sendable {
         }
     }
     
-    /// Get all assets from the library (fast - doesn't check local status)
-    public static func getAllAssets() -> [AssetInfo] {
-        var assets: [AssetInfo] = []
-        
+    /// Fetch options shared by library scans: newest first, hidden assets excluded
+    private static func libraryFetchOptions() -> PHFetchOptions {
         let fetchOptions = PHFetchOptions()
         fetchOptions.sortDescriptors = [NSSortDescriptor(key: "creationDate", ascending: false)]
         fetchOptions.includeHiddenAssets = false
+        // Scans read the result once; no need for Photos to track changes to it
+        fetchOptions.wantsIncrementalChangeDetails = false
+        return fetchOptions
+    }
+    
+    /// Number of assets in the library (cheap - no per-asset work)
+    public static func libraryAssetCount() -> Int {
+        PHAsset.fetchAssets(with: libraryFetchOptions()).count
+    }
+    
+    /// Get all assets from the library (fast - doesn't check local status)
+    /// - Parameter excludedIdentifiers: Assets to leave out, e.g. ones already imported.
+    ///   They are skipped before their resources are loaded, which is the expensive part of a scan.
+    public static func getAllAssets(excluding excludedIdentifiers: Set<String> = []) -> [AssetInfo] {
+        var assets: [AssetInfo] = []
         
-        let fetchResult = PHAsset.fetchAssets(with: fetchOptions)
+        let fetchResult = PHAsset.fetchAssets(with: libraryFetchOptions())
+        assets.reserveCapacity(max(fetchResult.count - excludedIdentifiers.count, 0))
         
         fetchResult.enumerateObjects { asset, _, _ in
-            let resources = PHAssetResource.assetResources(for: asset)
-            let originalResource = resources.first { $0.type == .photo || $0.type == .video }
+            if excludedIdentifiers.contains(asset.localIdentifier) { return }
+            
+            // Classify resources in a single pass - this runs once per asset in the library
+            var originalResource: PHAssetResource?
+            var isProRAW = false
+            var hasPairedVideo = false
+            for resource in PHAssetResource.assetResources(for: asset) {
+                switch resource.type {
+                case .photo, .video:
+                    if originalResource == nil { originalResource = resource }
+                case .pairedVideo:
+                    // Actual paired video resource (type 9)
+                    hasPairedVideo = true
+                default:
+                    break
+                }
+                // ProRAW (DNG format)
+                if resource.uniformTypeIdentifier == "com.adobe.raw-image" {
+                    isProRAW = true
+                }
+            }
             var filename = originalResource?.originalFilename ?? ""
             
             // Fallback filename if empty
@@ -146,12 +182,6 @@ public final class PhotosFetcher: Sendable {
             let isTimelapse = subtypes.contains(.videoTimelapse)
             let isSpatialVideo = (subtypes.rawValue & 0x400000) != 0
             
-            // Check for ProRAW (DNG format)
-            let isProRAW = resources.contains { $0.uniformTypeIdentifier == "com.adobe.raw-image" }
-            
-            // Check for actual paired video resource (type 9)
-            let hasPairedVideo = resources.contains { $0.type == .pairedVideo }
-            
             assets.append(AssetInfo(
                 localIdentifier: asset.localIdentifier,
                 filename: filename,
@@ -176,37 +206,86 @@ public final class PhotosFetcher: Sendable {
         return assets
     }
     
+    /// Look up many assets with a single Photos fetch, keyed by local identifier
+    public static func fetchAssets(identifiers: [String]) -> [String: PHAsset] {
+        let options = PHFetchOptions()
+        options.wantsIncrementalChangeDetails = false
+        let fetchResult = PHAsset.fetchAssets(withLocalIdentifiers: identifiers, options: options)
+        
+        var assets: [String: PHAsset] = [:]
+        assets.reserveCapacity(fetchResult.count)
+        fetchResult.enumerateObjects { asset, _, _ in
+            assets[asset.localIdentifier] = asset
+        }
+        return assets
+    }
+    
     /// Check if an asset is available locally (synchronous)
     public static func isAssetLocal(_ identifier: String) -> Bool {
         let fetchResult = PHAsset.fetchAssets(withLocalIdentifiers: [identifier], options: nil)
         guard let asset = fetchResult.firstObject else { return false }
-        
+        return isAssetLocal(asset)
+    }
+    
+    /// Check if an already-fetched asset is available locally (synchronous)
+    public static func isAssetLocal(_ asset: PHAsset) -> Bool {
         let resources = PHAssetResource.assetResources(for: asset)
         guard let resource = resources.first(where: { $0.type == .photo || $0.type == .video }) ?? resources.first else {
             return false
         }
         
-        var isLocal = false
+        // The first chunk is enough to prove the original is on disk - resolve on it
+        // and cancel, rather than streaming the whole file (GBs for video) to check
+        final class ProbeState: @unchecked Sendable {
+            private var isLocal = false
+            private var resolved = false
+            private let lock = NSLock()
+            
+            func resolve(isLocal: Bool) -> Bool {
+                lock.lock()
+                defer { lock.unlock() }
+                if resolved { return false }
+                resolved = true
+                self.isLocal = isLocal
+                return true
+            }
+            
+            var result: Bool {
+                lock.lock()
+                defer { lock.unlock() }
+                return isLocal
+            }
+        }
+        let state = ProbeState()
         let semaphore = DispatchSemaphore(value: 0)
         
         let options = PHAssetResourceRequestOptions()
         options.isNetworkAccessAllowed = false
         
-        var gotData = false
-        PHAssetResourceManager.default().requestData(for: resource, options: options) { _ in
-            gotData = true
-        } completionHandler: { error in
-            isLocal = (error == nil && gotData)
-            semaphore.signal()
+        let manager = PHAssetResourceManager.default()
+        let requestID = manager.requestData(for: resource, options: options) { _ in
+            if state.resolve(isLocal: true) {
+                semaphore.signal()
+            }
+        } completionHandler: { _ in
+            // Finished without delivering data (or failed) - not available locally
+            if state.resolve(isLocal: false) {
+                semaphore.signal()
+            }
         }
         
         _ = semaphore.wait(timeout: .now() + 2.0)
-        return isLocal
+        manager.cancelDataRequest(requestID)
+        return state.result
     }
     
     /// Get count of locally available assets (samples for speed)
     public static func countLocalAssets(sampleSize: Int = 100) -> (local: Int, total: Int, estimated: Int) {
-        let allAssets = getAllAssets()
+        countLocalAssets(in: getAllAssets(), sampleSize: sampleSize)
+    }
+    
+    /// Same as `countLocalAssets(sampleSize:)`, for callers that already scanned the library
+    public static func countLocalAssets(in allAssets: [AssetInfo], sampleSize: Int = 100) -> (local: Int, total: Int, estimated: Int) {
         let total = allAssets.count
         
         if total == 0 { return (0, 0, 0) }
@@ -228,6 +307,18 @@ public final class PhotosFetcher: Sendable {
         return (localCount, total, estimatedLocal)
     }
     
+    /// Per-asset folder inside the staging directory. Original filenames repeat across
+    /// assets (IMG_0001.HEIC from different devices), so concurrent imports sharing one
+    /// flat folder would overwrite or delete each other's staged files.
+    public static func stagingDirectory(for identifier: String, in stagingDir: URL) -> URL {
+        stagingDir.appendingPathComponent(identifier.replacingOccurrences(of: "/", with: "_"))
+    }
+    
+    /// Remove an asset's staging folder along with anything still staged in it
+    public static func removeStagingDirectory(for identifier: String, in stagingDir: URL) {
+        try? FileManager.default.removeItem(at: stagingDirectory(for: identifier, in: stagingDir))
+    }
+    
     /// Download original asset to staging directory
     public static func downloadAsset(
         identifier: String,
@@ -273,7 +364,9 @@ public final class PhotosFetcher: Sendable {
             }
             filename = "\(identifier.replacingOccurrences(of: "/", with: "_")).\(ext)"
         }
-        let destURL = stagingDir.appendingPathComponent(filename)
+        let assetDir = stagingDirectory(for: identifier, in: stagingDir)
+        try? FileManager.default.createDirectory(at: assetDir, withIntermediateDirectories: true)
+        let destURL = assetDir.appendingPathComponent(filename)
         
         // Remove existing file if present
         try? FileManager.default.removeItem(at: destURL)
@@ -413,7 +506,8 @@ public final class PhotosFetcher: Sendable {
     }
     
     /// Download just the paired video component
-    private static func downloadPairedVideo(
+    /// Used by repair flows that already have the image in Immich and only need the motion video
+    public static func downloadPairedVideo(
         identifier: String,
         to stagingDir: URL,
         timeout: TimeInterval = 300,
@@ -452,7 +546,9 @@ public final class PhotosFetcher: Sendable {
             // Use identifier with _video suffix
             videoFilename = "\(identifier.replacingOccurrences(of: "/", with: "_"))_video.mov"
         }
-        let destURL = stagingDir.appendingPathComponent(videoFilename)
+        let assetDir = stagingDirectory(for: identifier, in: stagingDir)
+        try? FileManager.default.createDirectory(at: assetDir, withIntermediateDirectories: true)
+        let destURL = assetDir.appendingPathComponent(videoFilename)
         
         // Remove existing file if present
         try? FileManager.default.removeItem(at: destURL)
@@ -656,7 +752,9 @@ public final class PhotosFetcher: Sendable {
         }
 
         let filename = filenameOverride ?? resource.originalFilename
-        let destURL = stagingDir.appendingPathComponent(filename)
+        let assetDir = stagingDirectory(for: identifier, in: stagingDir)
+        try? FileManager.default.createDirectory(at: assetDir, withIntermediateDirectories: true)
+        let destURL = assetDir.appendingPathComponent(filename)
 
         // Remove existing file if present
         try? FileManager.default.removeItem(at: destURL)
@@ -1,5 +1,6 @@
 import Testing
 import Foundation
+import SQLite3
 @testable import PhotosSyncLib
 
 @Suite("Tracker Database Tests")
@@ -17,6 +18,14 @@ struct TrackerSpec {
         try? FileManager.default.removeItem(at: dbPath)
         try? FileManager.default.removeItem(at: URL(fileURLWithPath: dbPath.path + "-wal"))
         try? FileManager.default.removeItem(at: URL(fileURLWithPath: dbPath.path + "-shm"))
+    }    }
+    
+    /// Run raw SQL against the test database through a separate connection
+    func execSQL(_ sql: String, at dbPath: URL) -> Bool {
+        var db: OpaquePointer?
+        defer { sqlite3_close(db) }
+        guard sqlite3_open(dbPath.path, &db) == SQLITE_OK else { return false }
+        return sqlite3_exec(db, sql, nil, nil, nil) == SQLITE_OK
     }
     
     @Test("Creates database and tables successfully")
@@ -90,6 +99,22 @@ struct TrackerSpec {
         #expect(stats.totalBytes == 8000)
     }
     
+    @Test("Re-import resets the archived flag, as a full row replace did")
+    func reImportResetsArchived() throws {
+        let (tracker, dbPath) = try createTestTracker()
+        defer { cleanup(dbPath) }
+        
+        let uuid = "reimport-archived"
+        try tracker.markImported(uuid: uuid, immichID: "old-id", filename: "x.jpg", fileSize: 100, mediaType: "photo")
+        try tracker.markArchived(uuid: uuid)
+        
+        try tracker.markImported(uuid: uuid, immichID: "new-id", filename: "x.jpg", fileSize: 200, mediaType: "photo")
+        
+        #expect(!tracker.isArchived(uuid: uuid))
+        #expect(tracker.getImmichIDForUUID(uuid) == "new-id")
+        #expect(tracker.getStats().totalBytes == 200)
+    }
+    
     @Test("Marks asset as archived")
     func markArchived() throws {
         let (tracker, dbPath) = try createTestTracker()
@@ -170,6 +195,125 @@ struct TrackerSpec {
         #expect(tracker.getImportedUUIDs().count == 1)
     }
     
+    @Test("Marks a batch of assets as imported")
+    func markImportedBatch() throws {
+        let (tracker, dbPath) = try createTestTracker()
+        defer { cleanup(dbPath) }
+        
+        try tracker.markImportedBatch([
+            Tracker.ImportRecord(uuid: "b1", immichID: "i1", filename: "a.jpg", fileSize: 100, mediaType: "photo"),
+            Tracker.ImportRecord(uuid: "b2", immichID: "i2", filename: "b.mov", fileSize: 200, mediaType: "video"),
+            Tracker.ImportRecord(
+                uuid: "b3",
+                immichID: "i3",
+                filename: "c.heic",
+                fileSize: 300,
+                mediaType: "photo",
+                subtypes: Tracker.AssetSubtypes(isLivePhoto: true, hasPairedVideo: true),
+                motionVideoImmichID: "motion-3"
+            )
+        ])
+        
+        #expect(tracker.getImportedUUIDs() == ["b1", "b2", "b3"])
+        #expect(tracker.getImmichIDForUUID("b2") == "i2")
+        #expect(tracker.hasMotionVideoBackup(uuid: "b3") == true)
+        
+        let stats = tracker.getStats()
+        #expect(stats.photos == 2)
+        #expect(stats.videos == 1)
+        #expect(stats.totalBytes == 600)
+    }
+    
+    @Test("Bulk load with index rebuild keeps every index")
+    func markImportedBatchRebuildsIndexes() throws {
+        let (tracker, dbPath) = try createTestTracker()
+        defer { cleanup(dbPath) }
+        
+        func indexNames() -> Set<String> {
+            var db: OpaquePointer?
+            var stmt: OpaquePointer?
+            defer {
+                sqlite3_finalize(stmt)
+                sqlite3_close(db)
+            }
+            guard sqlite3_open(dbPath.path, &db) == SQLITE_OK,
+                  sqlite3_prepare_v2(db, "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'imported_assets'", -1, &stmt, nil) == SQLITE_OK else {
+                return []
+            }
+            var names = Set<String>()
+            while sqlite3_step(stmt) == SQLITE_ROW {
+                names.insert(String(cString: sqlite3_column_text(stmt, 0)))
+            }
+            return names
+        }
+        
+        let before = indexNames()
+        #expect(before.contains("idx_imported_at"))
+        
+        let records = (0..<100).map {
+            Tracker.ImportRecord(uuid: "bulk-\($0)", immichID: "i\($0)", filename: "\($0).jpg", fileSize: 10, mediaType: "photo")
+        }
+        try tracker.markImportedBatch(records, rebuildIndexes: true)
+        
+        #expect(indexNames() == before)
+        #expect(tracker.getImportedUUIDs().count == 100)
+        #expect(tracker.getStats().totalBytes == 1000)
+    }
+    
+    @Test("Updates subtypes for a batch of assets")
+    func updateSubtypesBatch() throws {
+        let (tracker, dbPath) = try createTestTracker()
+        defer { cleanup(dbPath) }
+        
+        try tracker.markImported(uuid: "s1", immichID: "i1", filename: "a.heic", fileSize: 100, mediaType: "photo")
+        try tracker.markImported(uuid: "s2", immichID: "i2", filename: "b.mov", fileSize: 200, mediaType: "video")
+        
+        try tracker.updateSubtypesBatch([
+            (uuid: "s1", subtypes: Tracker.AssetSubtypes(isLivePhoto: true, hasPairedVideo: true)),
+            (uuid: "s2", subtypes: Tracker.AssetSubtypes(isCinematic: true))
+        ])
+        
+        #expect(tracker.isLivePhoto(uuid: "s1") == true)
+        #expect(tracker.isCinematic(uuid: "s2") == true)
+        #expect(tracker.getImmichIDForUUID("s1") == "i1")
+    }
+    
+    @Test("Cleanup info matches the per-asset lookups")
+    func getCleanupInfo() throws {
+        let (tracker, dbPath) = try createTestTracker()
+        defer { cleanup(dbPath) }
+        
+        let liveSubtypes = Tracker.AssetSubtypes(isLivePhoto: true, hasPairedVideo: true)
+        try tracker.markImported(uuid: "plain", immichID: "i1", filename: "a.jpg", fileSize: 100, mediaType: "photo")
+        try tracker.markImported(uuid: "live-backed", immichID: "i2", filename: "b.heic", fileSize: 100, mediaType: "photo",
+                                 subtypes: liveSubtypes, motionVideoImmichID: "motion-2")
+        try tracker.markImported(uuid: "live-missing", immichID: "i3", filename: "c.heic", fileSize: 100, mediaType: "photo",
+                                 subtypes: liveSubtypes)
+        try tracker.markArchived(uuid: "plain")
+        
+        let info = tracker.getCleanupInfo()
+        
+        #expect(info.count == 3)
+        for uuid in ["plain", "live-backed", "live-missing"] {
+            #expect(info[uuid]?.immichID == tracker.getImmichIDForUUID(uuid))
+            #expect(info[uuid]?.isArchived == tracker.isArchived(uuid: uuid))
+            #expect(info[uuid]?.hasMotionVideoBackup == tracker.hasMotionVideoBackup(uuid: uuid))
+        }
+        #expect(info["plain"]?.isArchived == true)
+        #expect(info["live-missing"]?.hasPairedVideo == true)
+        #expect(info["live-missing"]?.hasMotionVideoBackup == false)
+    }
+    
+    @Test("Empty batch is a no-op")
+    func markImportedEmptyBatch() throws {
+        let (tracker, dbPath) = try createTestTracker()
+        defer { cleanup(dbPath) }
+        
+        try tracker.markImportedBatch([])
+        
+        #expect(tracker.getImportedUUIDs().isEmpty)
+    }
+    
     // MARK: - Paired Video / Live Photo Tests
     
     @Test("Marks Live Photo with motion video using subtypes")
@@ -509,6 +653,47 @@ struct TrackerSpec {
         #expect(problems[0].mediaType == "photo")
     }
     
+    @Test("getProblemAssets parses stored timestamps")
+    func problemAssetDates() throws {
+        let (tracker, dbPath) = try createTestTracker()
+        defer { cleanup(dbPath) }
+        
+        let createdAt = Date(timeIntervalSince1970: 1_700_000_000)
+        try tracker.markFailed(
+            uuid: "failed-1",
+            filename: "failed.jpg",
+            mediaType: "photo",
+            reason: "Upload timeout",
+            createdAt: createdAt
+        )
+        
+        // imported_at is normally written by SQLite's datetime('now'), in UTC with second precision
+        #expect(execSQL("UPDATE imported_assets SET imported_at = '2024-01-02 03:04:05' WHERE icloud_uuid = 'failed-1'", at: dbPath))
+        
+        let problems = tracker.getProblemAssets()
+        #expect(problems.count == 1)
+        #expect(problems[0].createdAt == createdAt)
+        #expect(problems[0].recordedAt == Date(timeIntervalSince1970: 1_704_164_645))
+    }
+    
+    @Test("Backup destination timestamps parse as UTC")
+    func backupDestinationDates() throws {
+        let (tracker, dbPath) = try createTestTracker()
+        defer { cleanup(dbPath) }
+        
+        _ = try tracker.createBackupDestination(
+            name: "b2-primary",
+            type: "b2",
+            bucketName: "my-bucket",
+            remotePath: "/backups/immich"
+        )
+        #expect(execSQL("UPDATE backup_destinations SET created_at = '2024-01-02 03:04:05', last_backup_at = '2024-06-30 23:59:59' WHERE name = 'b2-primary'", at: dbPath))
+        
+        let dest = tracker.getBackupDestination(name: "b2-primary")
+        #expect(dest?.createdAt == Date(timeIntervalSince1970: 1_704_164_645))
+        #expect(dest?.lastBackupAt == Date(timeIntervalSince1970: 1_719_791_999))
+    }
+    
     @Test("markSkipped records skipped asset")
     func markSkipped() throws {
         let (tracker, dbPath) = try createTestTracker()
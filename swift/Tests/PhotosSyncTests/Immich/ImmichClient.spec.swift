@@ -1,5 +1,6 @@
 import Testing
 import Foundation
+import CryptoKit
 @testable import PhotosSyncLib
 
 // MARK: - Mock URLProtocol for testing HTTP requests
@@ -7,6 +8,8 @@ import Foundation
 final class MockURLProtocol: URLProtocol, @unchecked Sendable {
     nonisolated(unsafe) static var requestHandler: ((URLRequest) throws -> (HTTPURLResponse, Data))?
     nonisolated(unsafe) static var capturedRequests: [URLRequest] = []
+    /// Paged listings have several requests in flight at once
+    private static let captureLock = NSLock()
     
     override class func canInit(with request: URLRequest) -> Bool {
         return true
@@ -17,7 +20,9 @@ final class MockURLProtocol: URLProtocol, @unchecked Sendable {
     }
     
     override func startLoading() {
-        MockURLProtocol.capturedRequests.append(request)
+        MockURLProtocol.captureLock.withLock {
+            MockURLProtocol.capturedRequests.append(request)
+        }
         
         guard let handler = MockURLProtocol.requestHandler else {
             client?.urlProtocol(self, didFailWithError: URLError(.badServerResponse))
@@ -66,6 +71,31 @@ func mockResponse(url: URL, statusCode: Int, json: Any? = nil) -> (HTTPURLRespon
     return (response, data)
 }
 
+/// Request body as sent - URLProtocol sees streamed bodies as httpBodyStream, not httpBody
+func requestBody(_ request: URLRequest) -> Data? {
+    if let body = request.httpBody { return body }
+    guard let stream = request.httpBodyStream else { return nil }
+    
+    stream.open()
+    defer { stream.close() }
+    
+    var data = Data()
+    var buffer = [UInt8](repeating: 0, count: 16 * 1024)
+    while true {
+        let count = stream.read(&buffer, maxLength: buffer.count)
+        if count <= 0 { break }
+        data.append(buffer, count: count)
+    }
+    return data
+}
+
+/// Page number from a /api/search/metadata request body
+func searchPage(_ request: URLRequest) -> Int? {
+    guard let body = requestBody(request),
+          let json = try? JSONSerialization.jsonObject(with: body) as? [String: Any] else { return nil }
+    return json["page"] as? Int
+}
+
 // MARK: - Tests
 
 @Suite("ImmichClient API Tests", .serialized)
@@ -87,6 +117,8 @@ struct ImmichClientSpec {
         
         MockURLProtocol.requestHandler = { request in
             #expect(request.url?.path == "/api/server/ping")
+            #expect(request.httpMethod == "HEAD")
+            #expect(request.timeoutInterval == 5)
             #expect(request.value(forHTTPHeaderField: "x-api-key") == "test-api-key")
             return mockResponse(url: request.url!, statusCode: 200, json: ["res": "pong"])
         }
@@ -95,6 +127,23 @@ struct ImmichClientSpec {
         #expect(result == true)
     }
     
+    @Test("ping falls back to GET when HEAD is not allowed")
+    func pingFallsBackToGet() async {
+        let session = createMockSession()
+        let client = ImmichClient(baseURL: baseURL, apiKey: apiKey, session: session)
+        
+        var methods: [String] = []
+        MockURLProtocol.requestHandler = { request in
+            methods.append(request.httpMethod ?? "")
+            let status = request.httpMethod == "HEAD" ? 405 : 200
+            return mockResponse(url: request.url!, statusCode: status, json: ["res": "pong"])
+        }
+        
+        let result = await client.ping()
+        #expect(result == true)
+        #expect(methods == ["HEAD", "GET"])
+    }
+    
     @Test("ping returns false on non-200 response")
     func pingFailure() async {
         let session = createMockSession()
@@ -128,12 +177,13 @@ struct ImmichClientSpec {
         let session = createMockSession()
         let client = ImmichClient(baseURL: baseURL, apiKey: apiKey, session: session)
         
-        var pageRequests = 0
         MockURLProtocol.requestHandler = { request in
-            pageRequests += 1
             #expect(request.url?.path == "/api/assets")
             
-            if pageRequests == 1 {
+            // Pages are requested concurrently, so answer by page number rather than arrival order
+            let page = URLComponents(url: request.url!, resolvingAgainstBaseURL: false)?
+                .queryItems?.first { $0.name == "page" }?.value
+            if page == "1" {
                 // First page with 2 assets
                 return mockResponse(url: request.url!, statusCode: 200, json: [
                     ["id": "asset-1", "type": "IMAGE"],
@@ -309,6 +359,65 @@ struct ImmichClientSpec {
         #expect(result.error == nil)
     }
     
+    @Test("uploadAsset streams a complete multipart body with matching Content-Length")
+    func uploadAssetStreamsBody() async throws {
+        let session = createMockSession()
+        let client = ImmichClient(baseURL: baseURL, apiKey: apiKey, session: session)
+        
+        // Larger than the stream buffer, so the writer has to wait for the reader
+        let fileData = Data((0..<200_000).map { UInt8($0 % 251) })
+        let tempFile = FileManager.default.temporaryDirectory.appendingPathComponent("test-upload-stream.mov")
+        try fileData.write(to: tempFile)
+        defer { try? FileManager.default.removeItem(at: tempFile) }
+        
+        MockURLProtocol.requestHandler = { request in
+            let body = requestBody(request) ?? Data()
+            #expect(request.value(forHTTPHeaderField: "Content-Length") == String(body.count))
+            #expect(body.range(of: fileData) != nil)
+            #expect(body.range(of: Data("name=\"deviceAssetId\"".utf8)) != nil)
+            #expect(body.range(of: Data("Content-Type: video/quicktime".utf8)) != nil)
+            
+            return mockResponse(url: request.url!, statusCode: 201, json: ["id": "streamed-id"])
+        }
+        
+        let result = await client.uploadAsset(
+            fileURL: tempFile,
+            deviceAssetID: "device-asset-stream",
+            fileCreatedAt: nil,
+            fileModifiedAt: nil
+        )
+        
+        #expect(result.success == true)
+        #expect(result.assetID == "streamed-id")
+    }
+    
+    @Test("upload delegate hands out a fresh, complete body stream for each resend")
+    func uploadBodyProviderResends() async throws {
+        let fileData = Data((0..<200_000).map { UInt8($0 % 251) })
+        let tempFile = FileManager.default.temporaryDirectory.appendingPathComponent("test-upload-resend.mov")
+        try fileData.write(to: tempFile)
+        defer { try? FileManager.default.removeItem(at: tempFile) }
+        
+        let body = MultipartBody(header: Data("header\r\n".utf8), fileURL: tempFile, trailer: Data("\r\ntrailer".utf8))
+        let expected = body.header + fileData + body.trailer
+        
+        // The first stream is the one attached to the request; reading it to the end
+        // exhausts it, which is when URLSession asks the delegate for another
+        var first = URLRequest(url: URL(string: baseURL)!)
+        first.httpBodyStream = body.makeStream()
+        #expect(requestBody(first) == expected)
+        
+        let session = createMockSession()
+        let task = session.dataTask(with: URL(string: baseURL)!)
+        let provider = UploadBodyProvider(body: body)
+        for _ in 0..<2 {
+            var resend = URLRequest(url: URL(string: baseURL)!)
+            resend.httpBodyStream = await provider.urlSession(session, needNewBodyStreamForTask: task)
+            #expect(requestBody(resend) == expected)
+            #expect(UInt64(expected.count) == body.contentLength(fileSize: UInt64(fileData.count)))
+        }
+    }
+    
     @Test("uploadAsset detects duplicate on 200")
     func uploadAssetDuplicate() async throws {
         let session = createMockSession()
@@ -379,6 +488,23 @@ struct ImmichClientSpec {
         #expect(result.error == "Could not read file")
     }
     
+    @Test("uploadAsset fails a missing file before the duplicate check")
+    func uploadAssetFileNotFoundSkipsDuplicateCheck() async {
+        let session = createMockSession()
+        let client = ImmichClient(baseURL: baseURL, apiKey: apiKey, session: session)
+        
+        let result = await client.uploadAsset(
+            fileURL: URL(fileURLWithPath: "/nonexistent/file.jpg"),
+            deviceAssetID: "device-asset-123",
+            fileCreatedAt: nil,
+            fileModifiedAt: nil,
+            checkDuplicate: true
+        )
+        
+        #expect(result.error == "Could not read file")
+        #expect(MockURLProtocol.capturedRequests.isEmpty)
+    }
+    
     // MARK: - getAllAssets() tests
     
     @Test("getAllAssets returns paginated assets with metadata")
@@ -386,13 +512,11 @@ struct ImmichClientSpec {
         let session = createMockSession()
         let client = ImmichClient(baseURL: baseURL, apiKey: apiKey, session: session)
         
-        var pageRequests = 0
         MockURLProtocol.requestHandler = { request in
-            pageRequests += 1
             #expect(request.httpMethod == "POST")
             #expect(request.url?.path == "/api/search/metadata")
             
-            if pageRequests == 1 {
+            if searchPage(request) == 1 {
                 return mockResponse(url: request.url!, statusCode: 200, json: [
                     "assets": [
                         "items": [
@@ -421,6 +545,37 @@ struct ImmichClientSpec {
         #expect(assets[1].type == "VIDEO")
     }
     
+    @Test("getAllAssets keeps page order across concurrent page fetches")
+    func getAllAssetsPageOrder() async {
+        let session = createMockSession()
+        let client = ImmichClient(baseURL: baseURL, apiKey: apiKey, session: session)
+        
+        // Six full pages spans more than one wave of concurrent requests
+        let lastPage = 6
+        MockURLProtocol.requestHandler = { request in
+            let page = searchPage(request) ?? 0
+            guard page <= lastPage else {
+                return mockResponse(url: request.url!, statusCode: 200, json: [
+                    "assets": ["items": [], "nextPage": NSNull()]
+                ])
+            }
+            
+            return mockResponse(url: request.url!, statusCode: 200, json: [
+                "assets": [
+                    "items": [
+                        ["id": "asset-\(page)", "deviceAssetId": "device-\(page)", "type": "IMAGE"]
+                    ],
+                    "nextPage": page < lastPage ? String(page + 1) : NSNull()
+                ]
+            ])
+        }
+        
+        var progressCounts: [Int] = []
+        let assets = await client.getAllAssets(deviceId: nil) { progressCounts.append($0) }
+        #expect(assets.map(\.id) == (1...lastPage).map { "asset-\($0)" })
+        #expect(progressCounts == Array(1...lastPage))
+    }
+    
     // MARK: - URL handling tests
     
     @Test("trims trailing slash from baseURL")
@@ -437,6 +592,93 @@ struct ImmichClientSpec {
         _ = await client.ping()
     }
     
+    // MARK: - Session tests
+    
+    @Test("makeSession allows concurrent connections and disables caching")
+    func makeSessionConfiguration() {
+        let session = ImmichClient.makeSession(maxConnectionsPerHost: 12)
+        defer { session.invalidateAndCancel() }
+        
+        #expect(session.configuration.httpMaximumConnectionsPerHost == 12)
+        #expect(session.configuration.urlCache == nil)
+    }
+    
+    // MARK: - Duplicate check tests
+    
+    @Test("checksum is the SHA-1 of the file as hex")
+    func checksumOfFile() throws {
+        let tempFile = FileManager.default.temporaryDirectory.appendingPathComponent("test-checksum.txt")
+        try "abc".data(using: .utf8)!.write(to: tempFile)
+        defer { try? FileManager.default.removeItem(at: tempFile) }
+        
+        #expect(ImmichClient.checksum(forFileAt: tempFile) == "a9993e364706816aba3e25717850c26c9cd0d89d")
+    }
+    
+    @Test("checksum covers files spanning several read buffers")
+    func checksumOfLargeFile() throws {
+        let tempFile = FileManager.default.temporaryDirectory.appendingPathComponent("test-checksum-large.bin")
+        // 2.5 MiB: two full buffers and a partial one
+        let data = Data((0..<(5 << 19)).map { UInt8($0 % 253) })
+        try data.write(to: tempFile)
+        defer { try? FileManager.default.removeItem(at: tempFile) }
+        
+        let expected = Insecure.SHA1.hash(data: data).map { String(format: "%02x", $0) }.joined()
+        #expect(ImmichClient.checksum(forFileAt: tempFile) == expected)
+    }
+    
+    @Test("checkDuplicates returns only rejected duplicates")
+    func checkDuplicatesParsesResults() async {
+        let session = createMockSession()
+        let client = ImmichClient(baseURL: baseURL, apiKey: apiKey, session: session)
+        
+        MockURLProtocol.requestHandler = { request in
+            #expect(request.httpMethod == "POST")
+            #expect(request.url?.path == "/api/assets/bulk-upload-check")
+            return mockResponse(url: request.url!, statusCode: 200, json: [
+                "results": [
+                    ["id": "a", "action": "reject", "reason": "duplicate", "assetId": "existing-a"],
+                    ["id": "b", "action": "accept"]
+                ]
+            ])
+        }
+        
+        let duplicates = await client.checkDuplicates(["a": "sha-a", "b": "sha-b"])
+        
+        #expect(duplicates == ["a": "existing-a"])
+    }
+    
+    @Test("uploadAsset skips the upload when Immich already has the file")
+    func uploadAssetSkipsDuplicate() async throws {
+        let session = createMockSession()
+        let client = ImmichClient(baseURL: baseURL, apiKey: apiKey, session: session)
+        
+        let tempFile = FileManager.default.temporaryDirectory.appendingPathComponent("test-upload-known.jpg")
+        try "fake image data".data(using: .utf8)!.write(to: tempFile)
+        defer { try? FileManager.default.removeItem(at: tempFile) }
+        
+        MockURLProtocol.requestHandler = { request in
+            #expect(request.url?.path == "/api/assets/bulk-upload-check")
+            return mockResponse(url: request.url!, statusCode: 200, json: [
+                "results": [
+                    ["id": "device-asset-123", "action": "reject", "reason": "duplicate", "assetId": "existing-id"]
+                ]
+            ])
+        }
+        
+        let result = await client.uploadAsset(
+            fileURL: tempFile,
+            deviceAssetID: "device-asset-123",
+            fileCreatedAt: nil,
+            fileModifiedAt: nil,
+            checkDuplicate: true
+        )
+        
+        #expect(result.success == true)
+        #expect(result.duplicate == true)
+        #expect(result.assetID == "existing-id")
+        #expect(MockURLProtocol.capturedRequests.allSatisfy { $0.url?.path != "/api/assets" })
+    }
+    
     // MARK: - deleteAssets() tests
     
     @Test("deleteAssets returns success on 204 response")
@@ -513,11 +755,9 @@ struct ImmichClientSpec {
             #expect(request.url?.path == "/api/assets")
             
             // Check that livePhotoVideoId is in the multipart body
-            if let body = request.httpBody,
-               let bodyString = String(data: body, encoding: .utf8) {
-                #expect(bodyString.contains("livePhotoVideoId"))
-                #expect(bodyString.contains("video-immich-id-123"))
-            }
+            let bodyString = requestBody(request).flatMap { String(data: $0, encoding: .utf8) }
+            #expect(bodyString?.contains("livePhotoVideoId") == true)
+            #expect(bodyString?.contains("video-immich-id-123") == true)
             
             return mockResponse(url: request.url!, statusCode: 201, json: [
                 "id": "new-asset-id",